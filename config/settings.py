@@ -24,12 +24,14 @@ class Settings:
         'max_workers': int(os.getenv('MAX_WORKERS', '16')),
         'min_workers': 4,
         'browser_pool_size': int(os.getenv('BROWSER_POOL_SIZE', '16')),  # 与max_workers保持一致
+        'classification_max_workers': int(os.getenv('CLASSIFICATION_MAX_WORKERS', '16')),  # 叶节点检测并发页面数（异步信号量上限）
         'timeout': 60,
         'page_load_timeout': 90,
         'retry_times': 3,
         'retry_delay': 5,
         'scroll_pause': 1.3,
-        'headless': True,  # 是否使用无头模式
+        'headless': os.getenv('CRAWLER_HEADLESS', 'true').lower() != 'false',  # 是否使用无头模式（CRAWLER_HEADLESS=false 可切换为有界面调试）
+        'playwright_headless': os.getenv('CRAWLER_HEADLESS', 'true').lower() != 'false',  # 叶节点检测 Playwright 浏览器
         'user_agents': [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -7,8 +7,10 @@
 从 "/en/product..." 转换为 "https://www.traceparts.cn/en/product..."
 """
 
+import argparse
 import json
 import os
+import sys
 from pathlib import Path
 import time
 
@@ -135,11 +137,22 @@ if __name__ == "__main__":
     print("🚀 产品URL修复工具")
     print("=" * 60)
     
+    parser = argparse.ArgumentParser(description="修复产品缓存中的相对URL")
+    parser.add_argument('-y', '--yes', action='store_true', help='跳过确认直接修复（适用于CI/批量执行）')
+    args = parser.parse_args()
+    
     show_sample_before_after()
     
-    # 确认是否继续
-    response = input("是否开始修复？(y/N): ").strip().lower()
+    # 确认是否继续：仅在交互式终端下提示，非TTY环境不阻塞等待输入
+    if args.yes:
+        response = 'y'
+    elif sys.stdin.isatty():
+        response = input("是否开始修复？(y/N): ").strip().lower()
+    else:
+        print("⚠️ 非交互式环境且未指定 --yes，跳过确认提示")
+        response = 'n'
+    
     if response in ['y', 'yes']:
         fix_product_urls()
     else:
-        print("❌ 操作已取消") 
\ No newline at end of file
+        print("❌ 操作已取消") 
@@ -21,6 +21,122 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException,
 class AdaptiveSpecsParser:
     """自适应规格解析器 - 集成test-09-1完整逻辑"""
     
+    # 延长等待策略的目标：表格或规格容器（XPath 并集，每次轮询只查询一次DOM）
+    AJAX_CONTENT_XPATH = "//table | //div[contains(@class, 'spec')]"
+    
+    # 等待元素策略的目标（XPath 并集）
+    WAIT_ELEMENTS_XPATH = " | ".join([
+        "//table[@class]",
+        "//div[@class='specifications']",
+        "//div[@class='product-details']",
+        "//tr[td]"
+    ])
+    
+    # 通过标题定位规格表格的XPath（按优先级排列，小写转换表只定义一次）
+    _LOWER = "translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+    TITLE_XPATHS = [
+        f"//h1[contains({_LOWER}, 'spec')]",
+        f"//h2[contains({_LOWER}, 'spec')]",
+        f"//h3[contains({_LOWER}, 'spec')]",
+        f"//h1[contains({_LOWER}, 'product')]",
+        f"//h2[contains({_LOWER}, 'product')]",
+        f"//div[contains({_LOWER}, 'spec')]",
+    ]
+    
+    # 依次求值XPath，按优先级返回所有可见且有文本的元素（去重）
+    FIND_VISIBLE_TITLES_JS = """
+        var xpaths = arguments[0];
+        var found = [];
+        for (var i = 0; i < xpaths.length; i++) {
+            var snapshot = document.evaluate(xpaths[i], document, null,
+                XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var j = 0; j < snapshot.snapshotLength; j++) {
+                var el = snapshot.snapshotItem(j);
+                var visible = !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+                if (visible && (el.innerText || '').trim() && found.indexOf(el) === -1) {
+                    found.push(el);
+                }
+            }
+        }
+        return found;
+    """
+    
+    # 表格校验/评分只看前几行，读取时即按行数截断，避免整表序列化
+    VALIDATE_TABLE_ROWS = 5
+    SCORE_TABLE_ROWS = 10
+    # 读取表格行：每行返回单元格文本（不可见单元格按空串处理，与 WebElement.text 一致）及是否全为th；arguments[1] 为行数上限
+    READ_TABLE_ROWS_JS = """
+        var rows = Array.from(arguments[0].querySelectorAll('tr'));
+        if (arguments[1]) rows = rows.slice(0, arguments[1]);
+        return rows.map(function (row) {
+            var cells = Array.from(row.querySelectorAll('td, th'));
+            return {
+                cells: cells.map(function (c) {
+                    return c.getClientRects().length ? (c.innerText || '').trim() : '';
+                }),
+                all_th: cells.length > 0 && row.querySelectorAll('th').length === cells.length
+            };
+        });
+    """
+    
+    # 分页信息关键词（小写）
+    PAGINATION_INDICATORS = [
+        "items per page", "out of", "total", "results", "showing",
+        "页面", "共", "总计", "显示"
+    ]
+    
+    # 遍历文本节点，返回首个包含分页关键词且可见元素的文本
+    FIND_PAGINATION_TEXT_JS = """
+        var indicators = arguments[0];
+        var walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+        var node;
+        while ((node = walker.nextNode())) {
+            var data = node.data.toLowerCase();
+            if (!indicators.some(function (k) { return data.indexOf(k) !== -1; })) {
+                continue;
+            }
+            var el = node.parentElement;
+            if (el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length)) {
+                var text = (el.innerText || '').trim();
+                if (text) {
+                    return text;
+                }
+            }
+        }
+        return null;
+    """
+    
+    # "All"选项的候选XPath（按优先级排列）
+    ALL_OPTION_XPATHS = [
+        "//li[normalize-space(.)='All']",
+        "//div[normalize-space(.)='All']",
+        "//option[normalize-space(.)='All']",
+        "//span[normalize-space(.)='All']",
+        "//button[normalize-space(.)='All']",
+        "//a[normalize-space(.)='All']",
+        "//*[@role='option'][normalize-space(.)='All']",
+        "//*[contains(@class,'option')][normalize-space(.)='All']",
+        "//*[contains(@class,'menu-item')][normalize-space(.)='All']"
+    ]
+    
+    # 依次求值XPath，返回第一个可见且未禁用的元素（option 以所属 select 的可见性为准）
+    FIND_FIRST_CLICKABLE_JS = """
+        var xpaths = arguments[0];
+        for (var i = 0; i < xpaths.length; i++) {
+            var snapshot = document.evaluate(xpaths[i], document, null,
+                XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (var j = 0; j < snapshot.snapshotLength; j++) {
+                var el = snapshot.snapshotItem(j);
+                var box = el.tagName === 'OPTION' ? (el.closest('select') || el) : el;
+                var visible = !!(box.offsetWidth || box.offsetHeight || box.getClientRects().length);
+                if (visible && !el.disabled) {
+                    return el;
+                }
+            }
+        }
+        return null;
+    """
+    
     def __init__(self, logger=None):
         self.logger = logger or logging.getLogger(__name__)
         
@@ -130,32 +246,21 @@ class AdaptiveSpecsParser:
             except TimeoutException:
                 self.logger.warning("页面body加载超时，继续处理")
             
-            # 基础等待
-            time.sleep(2)
+            # 基础等待：等文档加载完成即继续，不再固定休眠
+            self._wait_for_document_complete(driver, 5)
             
             # ========== Step 2: 检测动态内容并处理 ==========
             self.logger.debug("🔄 Step 2: 检测动态内容")
             
-            # 查找分页信息，判断是否需要等待动态加载
-            pagination_indicators = [
-                "items per page", "out of", "total", "results", "showing",
-                "页面", "共", "总计", "显示"
-            ]
-            
+            # 查找分页信息，判断是否需要等待动态加载（一次遍历文本节点，代替逐个关键词的XPath查询）
             has_pagination_text = False
-            for indicator in pagination_indicators:
-                try:
-                    elements = driver.find_elements(By.XPATH, 
-                        f"//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{indicator}')]")
-                    for elem in elements:
-                        if elem.is_displayed() and elem.text.strip():
-                            has_pagination_text = True
-                            self.logger.debug(f"发现分页信息: '{elem.text.strip()}'")
-                            break
-                    if has_pagination_text:
-                        break
-                except Exception:
-                    continue
+            try:
+                pagination_text = driver.execute_script(self.FIND_PAGINATION_TEXT_JS, self.PAGINATION_INDICATORS)
+                if pagination_text:
+                    has_pagination_text = True
+                    self.logger.debug(f"发现分页信息: '{pagination_text}'")
+            except Exception:
+                pass
             
             # ========== Step 3: 6种动态加载策略 ==========
             if has_pagination_text:
@@ -218,15 +323,30 @@ class AdaptiveSpecsParser:
         
         return "无策略成功"
     
+    def _wait_for_document_complete(self, driver, timeout: float) -> bool:
+        """等待 document.readyState 变为 complete，超时返回 False"""
+        try:
+            WebDriverWait(driver, timeout).until(
+                lambda d: d.execute_script("return document.readyState") == 'complete'
+            )
+            return True
+        except TimeoutException:
+            return False
+    
     def strategy_extended_wait(self, driver) -> bool:
         """策略1: 延长等待策略"""
         try:
             # 等待可能的AJAX内容加载
             WebDriverWait(driver, 15).until(
-                lambda d: len(d.find_elements(By.TAG_NAME, 'table')) > 0 or
-                         len(d.find_elements(By.XPATH, "//div[contains(@class, 'spec')]")) > 0
+                EC.presence_of_element_located((By.XPATH, self.AJAX_CONTENT_XPATH))
             )
-            time.sleep(3)
+            # 等待数据行填充（最多3秒），代替固定休眠
+            try:
+                WebDriverWait(driver, 3).until(
+                    EC.presence_of_element_located((By.XPATH, "//tr[td]"))
+                )
+            except TimeoutException:
+                pass
             return True
         except TimeoutException:
             return False
@@ -239,7 +359,7 @@ class AdaptiveSpecsParser:
             WebDriverWait(driver, 10).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
-            time.sleep(2)
+            self._wait_for_document_complete(driver, 5)
             return True
         except Exception:
             return False
@@ -259,60 +379,36 @@ class AdaptiveSpecsParser:
     def strategy_click_triggers(self, driver) -> bool:
         """策略4: 点击触发器策略"""
         try:
-            # 尝试点击"Show All"或"All"选项
-            all_selectors = [
-                "//li[normalize-space(.)='All']",
-                "//div[normalize-space(.)='All']",
-                "//option[normalize-space(.)='All']",
-                "//span[normalize-space(.)='All']",
-                "//button[normalize-space(.)='All']",
-                "//a[normalize-space(.)='All']",
-                "//*[@role='option'][normalize-space(.)='All']",
-                "//*[contains(@class,'option')][normalize-space(.)='All']",
-                "//*[contains(@class,'menu-item')][normalize-space(.)='All']"
-            ]
-            
-            clicked = False
-            for selector in all_selectors:
-                try:
-                    elements = driver.find_elements(By.XPATH, selector)
-                    for element in elements:
-                        if element.is_displayed() and element.is_enabled():
-                            self.logger.debug(f"找到All选项: {element.text}")
-                            element.click()
-                            time.sleep(3)
-                            clicked = True
-                            break
-                    if clicked:
-                        break
-                except Exception:
-                    continue
+            # 尝试点击"Show All"或"All"选项：按优先级在浏览器内一次查出首个可见可用元素
+            element = driver.execute_script(self.FIND_FIRST_CLICKABLE_JS, self.ALL_OPTION_XPATHS)
+            if element is None:
+                return False
             
-            return clicked
+            self.logger.debug(f"找到All选项: {element.text}")
+            rows_before = len(driver.find_elements(By.TAG_NAME, 'tr'))
+            element.click()
+            # 等待表格行数变化（最多3秒），代替固定休眠
+            try:
+                WebDriverWait(driver, 3).until(
+                    lambda d: len(d.find_elements(By.TAG_NAME, 'tr')) != rows_before
+                )
+            except TimeoutException:
+                pass
+            return True
         except Exception:
             return False
     
     def strategy_wait_elements(self, driver) -> bool:
         """策略5: 等待元素策略"""
         try:
-            # 等待特定元素出现
-            wait_selectors = [
-                "//table[@class]",
-                "//div[@class='specifications']",
-                "//div[@class='product-details']",
-                "//tr[td]"
-            ]
-            
-            for selector in wait_selectors:
-                try:
-                    WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.XPATH, selector))
-                    )
-                    return True
-                except TimeoutException:
-                    continue
-            
-            return False
+            # 等待特定元素出现（合并为一个XPath，任一出现即返回，最坏只等一次超时）
+            try:
+                WebDriverWait(driver, 5).until(
+                    EC.presence_of_element_located((By.XPATH, self.WAIT_ELEMENTS_XPATH))
+                )
+                return True
+            except TimeoutException:
+                return False
         except Exception:
             return False
     
@@ -345,49 +441,39 @@ class AdaptiveSpecsParser:
         # ========== 方式A: 通过标题查找表格 ==========
         self.logger.debug("🔍 方式A: 通过标题查找表格")
         
-        title_selectors = [
-            "//h1[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'spec')]",
-            "//h2[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'spec')]",
-            "//h3[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'spec')]",
-            "//h1[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'product')]",
-            "//h2[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'product')]",
-            "//div[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'spec')]",
-        ]
+        # 所有标题XPath在浏览器内按优先级一次求值，只返回可见且有文本的元素
+        try:
+            title_elements = driver.execute_script(self.FIND_VISIBLE_TITLES_JS, self.TITLE_XPATHS) or []
+        except Exception as e:
+            self.logger.debug(f"标题查找出错: {e}")
+            title_elements = []
+        self.logger.debug(f"标题选择器: 找到 {len(title_elements)} 个可见标题元素")
         
-        for selector_idx, selector in enumerate(title_selectors):
+        for elem in title_elements:
+            # 查找该元素附近的表格
             try:
-                elements = driver.find_elements(By.XPATH, selector)
-                self.logger.debug(f"选择器 {selector_idx+1}: 找到 {len(elements)} 个元素")
+                # 先尝试在同一父容器内查找
+                parent = elem.find_element(By.XPATH, "./..")
+                tables_in_parent = parent.find_elements(By.TAG_NAME, 'table')
                 
-                for elem in elements:
-                    if elem.is_displayed() and elem.text.strip():
-                        # 查找该元素附近的表格
-                        try:
-                            # 先尝试在同一父容器内查找
-                            parent = elem.find_element(By.XPATH, "./..")
-                            tables_in_parent = parent.find_elements(By.TAG_NAME, 'table')
-                            
-                            if not tables_in_parent:
-                                # 尝试在后续兄弟元素中查找
-                                tables_in_parent = elem.find_elements(By.XPATH, "./following-sibling::*//table")
-                            
-                            if not tables_in_parent:
-                                # 尝试在整个文档中查找该元素之后的表格
-                                tables_in_parent = elem.find_elements(By.XPATH, "./following::table")
-                            
-                            if tables_in_parent:
-                                candidate_table = tables_in_parent[0]
-                                
-                                # 检查表格是否真的包含产品数据
-                                if self.validate_table_content(candidate_table):
-                                    self.logger.debug("✅ 通过标题找到合适的表格")
-                                    return candidate_table
-                                    
-                        except Exception as e:
-                            self.logger.debug(f"分析元素附近表格时出错: {e}")
-                            
+                if not tables_in_parent:
+                    # 尝试在后续兄弟元素中查找
+                    tables_in_parent = elem.find_elements(By.XPATH, "./following-sibling::*//table")
+                
+                if not tables_in_parent:
+                    # 尝试在整个文档中查找该元素之后的表格
+                    tables_in_parent = elem.find_elements(By.XPATH, "./following::table")
+                
+                if tables_in_parent:
+                    candidate_table = tables_in_parent[0]
+                    
+                    # 检查表格是否真的包含产品数据
+                    if self.validate_table_content(candidate_table):
+                        self.logger.debug("✅ 通过标题找到合适的表格")
+                        return candidate_table
+                        
             except Exception as e:
-                self.logger.debug(f"选择器 {selector_idx+1} 出错: {e}")
+                self.logger.debug(f"分析元素附近表格时出错: {e}")
         
         # ========== 方式B: 表格评分机制 ==========
         self.logger.debug("🔍 方式B: 表格评分机制")
@@ -422,18 +508,21 @@ class AdaptiveSpecsParser:
             self.logger.warning("所有表格评分均为0，未找到合适的表格")
             return None
     
+    def read_table_rows(self, table, max_rows: Optional[int] = None) -> List[Dict[str, Any]]:
+        """一次 execute_script 读取表格行的单元格文本及是否全为th，避免逐行逐格往返；max_rows 限制只序列化前几行"""
+        return table.parent.execute_script(self.READ_TABLE_ROWS_JS, table, max_rows) or []
+    
     def validate_table_content(self, table) -> bool:
         """验证表格是否包含有意义的产品数据"""
         try:
-            rows = table.find_elements(By.TAG_NAME, 'tr')
+            rows = self.read_table_rows(table, max_rows=self.VALIDATE_TABLE_ROWS)
             if len(rows) < 2:
                 return False
             
             # 检查前几行是否有非空且有意义的内容
             meaningful_rows = 0
-            for row in rows[:5]:
-                cells = row.find_elements(By.CSS_SELECTOR, 'td, th')
-                cell_texts = [cell.text.strip() for cell in cells]
+            for row in rows:
+                cell_texts = row['cells']
                 non_empty_cells = [text for text in cell_texts if text and len(text) > 1]
                 
                 if len(non_empty_cells) >= 2:
@@ -448,13 +537,12 @@ class AdaptiveSpecsParser:
         score = 0
         
         try:
-            rows = table.find_elements(By.TAG_NAME, 'tr')
+            rows = self.read_table_rows(table, max_rows=self.SCORE_TABLE_ROWS)  # 只检查前10行
             if len(rows) < 2:
                 return 0
             
-            for row in rows[:10]:  # 只检查前10行
-                cells = row.find_elements(By.CSS_SELECTOR, 'td, th')
-                cell_texts = [cell.text.strip() for cell in cells]
+            for row in rows:
+                cell_texts = row['cells']
                 non_empty_cells = [text for text in cell_texts if text and len(text) > 1]
                 
                 if len(non_empty_cells) >= 2:
@@ -482,7 +570,7 @@ class AdaptiveSpecsParser:
         seen_references = set()
         
         try:
-            rows = table.find_elements(By.TAG_NAME, 'tr')
+            rows = self.read_table_rows(table)
             if len(rows) < 1:
                 return [], []
             
@@ -492,8 +580,7 @@ class AdaptiveSpecsParser:
             # 检查前几行是否都是2列格式
             two_col_count = 0
             for i, row in enumerate(rows[:5]):  # 检查前5行
-                cells = row.find_elements(By.CSS_SELECTOR, 'td, th')
-                if len(cells) == 2:
+                if len(row['cells']) == 2:
                     two_col_count += 1
             
             if two_col_count >= 3:  # 如果至少3行都是2列，可能是纵向表格
@@ -504,12 +591,12 @@ class AdaptiveSpecsParser:
             if is_vertical_table:
                 self.logger.debug("从纵向表格提取数据...")
                 for i, row in enumerate(rows):
-                    cells = row.find_elements(By.CSS_SELECTOR, 'td, th')
+                    cells = row['cells']
                     if len(cells) != 2:
                         continue
                     
-                    prop_name = cells[0].text.strip()
-                    prop_value = cells[1].text.strip()
+                    prop_name = cells[0]
+                    prop_value = cells[1]
                     
                     if prop_value and len(prop_value) >= 2 and prop_value not in seen_references:
                         # 智能判断：如果看起来像编号（包含数字或特殊格式）
@@ -538,17 +625,13 @@ class AdaptiveSpecsParser:
                 header_cells = []
                 
                 for i, row in enumerate(rows):
-                    cells = row.find_elements(By.CSS_SELECTOR, 'td, th')
-                    if not cells:
+                    if not row['cells']:
                         continue
                     
-                    # 如果是th元素，很可能是表头
-                    th_cells = row.find_elements(By.TAG_NAME, 'th')
-                    is_header_row = len(th_cells) == len(cells) and len(th_cells) > 0
-                    
-                    if is_header_row:
+                    # 如果全是th元素，很可能是表头
+                    if row['all_th']:
                         header_row_index = i
-                        header_cells = [cell.text.strip() for cell in cells]
+                        header_cells = row['cells']
                         all_headers = header_cells
                         self.logger.debug(f"识别表头行 {i+1}: {header_cells[:5]}...")
                         break
@@ -578,12 +661,10 @@ class AdaptiveSpecsParser:
                     if i <= header_row_index:  # 跳过表头及之前的行
                         continue
                         
-                    cells = row.find_elements(By.CSS_SELECTOR, 'td, th')
-                    if not cells:
+                    cell_texts = row['cells']
+                    if not cell_texts:
                         continue
                     
-                    cell_texts = [cell.text.strip() for cell in cells]
-                    
                     # 构建参数字典
                     parameters = {}
                     for j, cell_text in enumerate(cell_texts):
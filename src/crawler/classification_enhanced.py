@@ -9,11 +9,12 @@
 
 import re
 import time
+import asyncio
 import logging
 from typing import List, Dict, Any, Tuple
 from collections import defaultdict
 from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 import threading
 from queue import Queue
 import random
@@ -35,6 +36,7 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from config.settings import Settings
+from src.crawler.patterns import COUNT_PATTERNS, NUMBER_RESULTS_PATTERN, BLOCKED_ASSETS, BLOCKED_TRACKERS
 
 
 class EnhancedClassificationCrawler:
@@ -51,6 +53,55 @@ class EnhancedClassificationCrawler:
         "javascript:", "mailto:", "#", "cookie"
     ]
     
+    # 叶节点页面加载策略（同步/异步检测共用）：超时、重试次数/间隔、加载后稳定等待
+    LEAF_CHECK_GOTO_TIMEOUT_MS = 45000
+    LEAF_CHECK_NETWORKIDLE_TIMEOUT_MS = 10000
+    LEAF_CHECK_MAX_RETRIES = 2
+    LEAF_CHECK_RETRY_DELAY = 3
+    LEAF_CHECK_SETTLE_SECONDS = 2
+    
+    # 叶节点检测 Playwright 启动参数（同步/异步检测共用）
+    LEAF_CHECK_LAUNCH_ARGS = [
+        '--no-sandbox',
+        '--disable-dev-shm-usage',
+        '--disable-web-security',
+        '--disable-features=VizDisplayCompositor',
+        '--disable-blink-features=AutomationControlled',
+        '--no-first-run'
+    ]
+    
+    # 批量检测用的严格模式：匹配任意数字（可能带逗号分隔）+ 空格 + results
+    STRICT_RESULTS_PATTERN = re.compile(r'\b\d{1,3}(?:,\d{3})*\s+results?\b|\b\d{4,}\s+results?\b', re.IGNORECASE)
+    ZERO_RESULTS_PATTERN = re.compile(r'\b0\s+results?\b', re.IGNORECASE)
+    INTERFERENCE_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+        r'search\s+\d+\s+results',
+        r'filter\s+\d+\s+results',
+        r'found\s+\d+\s+results',
+        r'showing\s+\d+\s+results'
+    )]
+    
+    # 读取页面 body 文本（与 Playwright text_content("body") 一致）
+    BODY_TEXT_JS = "return document.body ? document.body.textContent : '';"
+    
+    # 批量提取分类链接信息的脚本（备选名称来源与原逐元素读取顺序一致）
+    EXTRACT_LINKS_JS = """
+        return Array.from(document.querySelectorAll("a[href*='traceparts-classification-']")).map(function (a) {
+            var text = (a.innerText || '').trim();
+            return {
+                href: a.href || '',
+                text: text,
+                alt: text ? [] : [
+                    a.getAttribute('title'),
+                    a.getAttribute('aria-label'),
+                    a.getAttribute('data-original-title'),
+                    a.innerText,
+                    a.textContent
+                ],
+                html: text ? '' : a.innerHTML
+            };
+        });
+    """
+    
     def __init__(self, log_level: int = logging.INFO, headless: bool = True, debug_mode: bool = False):
         """初始化分类爬取器"""
         self.logger = logging.getLogger("classification-crawler")
@@ -70,8 +121,8 @@ class EnhancedClassificationCrawler:
         self.pool_lock = threading.Lock()
         self.pool_initialized = False
     
-    def _prepare_driver(self) -> webdriver.Chrome:
-        """创建简单的Chrome驱动（test-06风格）"""
+    def _create_chrome_driver(self) -> webdriver.Chrome:
+        """统一的Chrome驱动工厂：选项与驱动级超时在此一次性设置"""
         if not SELENIUM_AVAILABLE:
             raise RuntimeError("Selenium未安装，无法运行分类爬取器！")
         
@@ -84,8 +135,13 @@ class EnhancedClassificationCrawler:
         chrome_options.add_argument('--window-size=1920,1080')
         chrome_options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
         
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.driver.set_page_load_timeout(40)
+        driver = webdriver.Chrome(options=chrome_options)
+        driver.set_page_load_timeout(40)
+        return driver
+    
+    def _prepare_driver(self) -> webdriver.Chrome:
+        """创建简单的Chrome驱动（test-06风格）"""
+        self.driver = self._create_chrome_driver()
         self.logger.info("✅ 简单浏览器创建完成")
         return self.driver
     
@@ -97,19 +153,9 @@ class EnhancedClassificationCrawler:
             
             self.logger.info(f"🏊 初始化浏览器池，创建 {pool_size} 个浏览器实例...")
             
-            chrome_options = Options()
-            if self.headless:
-                chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-            
             for i in range(pool_size):
                 try:
-                    driver = webdriver.Chrome(options=chrome_options)
-                    driver.set_page_load_timeout(40)
+                    driver = self._create_chrome_driver()
                     self.browser_pool.put(driver)
                     self.logger.info(f"  🎉 浏览器池 {i+1}/{pool_size} 创建并加入池中")
                 except Exception as e:
@@ -142,18 +188,7 @@ class EnhancedClassificationCrawler:
     
     def _create_pool_browser(self) -> webdriver.Chrome:
         """创建池用的浏览器实例"""
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        
-        driver = webdriver.Chrome(options=chrome_options)
-        driver.set_page_load_timeout(40)
-        return driver
+        return self._create_chrome_driver()
     
     def _return_browser_to_pool(self, driver: webdriver.Chrome):
         """将浏览器实例返回到池中"""
@@ -185,21 +220,24 @@ class EnhancedClassificationCrawler:
         self.logger.info(f"✅ 已关闭 {closed_count} 个浏览器")
     
     def _scroll_full(self, driver: webdriver.Chrome):
-        """滚动页面到底部（test-06风格）"""
+        """滚动页面到底部（test-06风格）：每次滚动后等待页面高度增长，高度在1.5秒内不再变化即视为加载完毕"""
         last_height = driver.execute_script("return document.body.scrollHeight")
         while True:
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1.5)
-            new_height = driver.execute_script("return document.body.scrollHeight")
-            if new_height == last_height:
+            try:
+                WebDriverWait(driver, 1.5, poll_frequency=0.1).until(
+                    lambda d: d.execute_script("return document.body.scrollHeight") != last_height
+                )
+            except TimeoutException:
                 break
-            last_height = new_height
+            last_height = driver.execute_script("return document.body.scrollHeight")
         # 回到顶部
         driver.execute_script("window.scrollTo(0,0);")
     
     def _extract_links(self, driver: webdriver.Chrome) -> List[Dict]:
         """提取分类链接（test-06风格）"""
-        elements = driver.find_elements(By.CSS_SELECTOR, "a[href*='traceparts-classification-']")
+        # 一次 execute_script 取回所有链接的 href/文本/备选属性，避免逐元素 WebDriver 往返
+        elements = driver.execute_script(self.EXTRACT_LINKS_JS) or []
         self.logger.info(f"🔗 共捕获 {len(elements)} 个包含 classification 的链接节点")
         records = []
         seen = set()
@@ -218,9 +256,9 @@ class EnhancedClassificationCrawler:
             return "Unnamed"
 
         for el in elements:
-            href = el.get_attribute('href') or ""
+            href = el.get('href') or ""
             # 可见文本
-            raw_text = el.text.strip()
+            raw_text = (el.get('text') or "").strip()
             if not href or any(pat in href.lower() for pat in self.EXCLUDE_PATTERNS):
                 continue
             # 去重
@@ -231,20 +269,13 @@ class EnhancedClassificationCrawler:
             name = raw_text
             # 如果可见文本为空，尝试其他属性
             if not name:
-                alt_sources = [
-                    el.get_attribute('title'),
-                    el.get_attribute('aria-label'),
-                    el.get_attribute('data-original-title'),
-                    el.get_attribute('innerText'),
-                    el.get_attribute('textContent')
-                ]
-                for src in alt_sources:
+                for src in el.get('alt') or []:
                     if src and src.strip():
                         name = src.strip()
                         break
             # 仍为空，解析 innerHTML 拿子元素文本
             if not name:
-                inner_html = el.get_attribute('innerHTML') or ""
+                inner_html = el.get('html') or ""
                 soup = BeautifulSoup(inner_html, 'html.parser')
                 txt = soup.get_text(" ", strip=True)
                 if txt:
@@ -345,14 +376,16 @@ class EnhancedClassificationCrawler:
             # 等待页面加载
             time.sleep(2)  # 减少等待时间
             
-            # 获取页面文本内容
-            page_text = self.driver.page_source
+            # 获取页面文本内容（只取 body 文本，不传输整页序列化 HTML）
+            page_text = self.driver.execute_script(self.BODY_TEXT_JS) or ""
             
             # === 叶节点检测（遵循 test/08 逻辑） ===
-            has_results_keyword = 'results' in page_text.lower()
-            has_sort_by = 'sort by' in page_text.lower()
+            # 页面文本只转换一次小写，后续关键字检测与数量提取共用
+            page_text_lower = page_text.lower()
+            has_results_keyword = 'results' in page_text_lower
+            has_sort_by = 'sort by' in page_text_lower
 
-            target_count = self._extract_target_product_count(page_text) if has_results_keyword else 0
+            target_count = self._extract_target_product_count(page_text_lower) if has_results_keyword else 0
             has_positive_count = target_count > 0
 
             is_leaf = has_results_keyword and has_sort_by and has_positive_count
@@ -396,54 +429,19 @@ class EnhancedClassificationCrawler:
 
         self.logger.info(f"🕵️‍♀️ 将检测 {len(potential_leaves_to_check)} 个潜在叶节点...")
         
-        # 使用线程池并行检测
-        # Ensure ThreadSafeLogger is used if logging from threads, which it is.
-        # Playwright in _check_single_leaf_node is thread-safe as it creates new instances.
-
-        # Limit max_workers to avoid overwhelming system resources, especially with Playwright
+        # 使用 async Playwright 并发检测：单个浏览器 + 每节点独立 context，Semaphore 限制并发
         effective_max_workers = min(max_workers, Settings.CRAWLER.get('classification_max_workers', 16))
         
-        # Results will be stored by node code to update the tree later
-        # However, direct tree modification from threads is not safe.
-        # We collect results and then update the main tree sequentially.
-        
-        # Progress tracking
-        processed_count = 0
-        lock = threading.Lock()
-
-        # Store results to apply them sequentially later
-        results_map = {} # node_code -> (is_leaf_status, product_count_from_check, details_dict)
-
-        def process_node(node, index, total):
-            nonlocal processed_count
-            node_code = node['code']
-            try:
-                # _check_single_leaf_node now returns: is_leaf, product_count, details_dict
-                is_leaf_status, product_count_from_check, details_dict = self._check_single_leaf_node(node)
-                with lock:
-                    results_map[node_code] = (is_leaf_status, product_count_from_check, details_dict)
-                    processed_count +=1
-                    if processed_count % 20 == 0 or processed_count == total:
-                         self.logger.info(f"⏳ 叶节点检测进度: {processed_count}/{total} ({(processed_count/total)*100:.1f}%)")
-                return # Result stored in map
-            except Exception as e:
-                self.logger.error(f"Error processing node {node.get('name', 'Unknown')} ({node_code}): {e}", exc_info=self.debug_mode)
-                with lock: # Still count as processed for progress
-                    results_map[node_code] = (False, 0, {'enhanced_url': node.get('url', ''), 'has_results_keyword': False, 'has_sort_by_keyword': False, 'error': str(e)}) # Store error info
-                    processed_count += 1 
-                return
-
-        with ThreadPoolExecutor(max_workers=effective_max_workers) as executor:
-            futures = []
-            for i, node_to_check in enumerate(potential_leaves_to_check):
-                futures.append(executor.submit(process_node, node_to_check, i + 1, len(potential_leaves_to_check)))
-            
-            # Wait for all futures to complete
-            for future in as_completed(futures):
-                try:
-                    future.result() # Ensure exceptions from threads are caught if not handled in process_node
-                except Exception as e:
-                    self.logger.error(f"Future result error during leaf verification: {e}", exc_info=self.debug_mode)
+        # 检测结果先收集到 map，再顺序更新树
+        # node_code -> (is_leaf_status, product_count_from_check, details_dict)
+        verify_coro = self._verify_leaf_nodes_async(potential_leaves_to_check, effective_max_workers)
+        try:
+            results_map = asyncio.run(verify_coro)
+        except Exception as e:
+            # 浏览器启动失败或已处于运行中的事件循环：回退到逐节点同步检测，单节点失败仍记为未验证
+            verify_coro.close()
+            self.logger.warning(f"⚠️ 异步叶节点检测不可用，回退到同步检测: {e}", exc_info=self.debug_mode)
+            results_map = self._verify_leaf_nodes_sync(potential_leaves_to_check, effective_max_workers)
 
         self.logger.info(f"🏁 所有 {len(potential_leaves_to_check)} 个潜在叶节点检测完成。开始更新树...")
 
@@ -497,120 +495,194 @@ class EnhancedClassificationCrawler:
         
         return tree_data
     
-    def _check_single_leaf_node(self, node: Dict) -> Tuple[bool, int, Dict]:
-        """单个叶节点检测（线程安全，独立driver），使用与 test-08 完全一致的 Playwright 逻辑"""
-        url = node.get('url')
-        node_name = node.get('name', 'UnknownNode')
+    def _leaf_check_context_options(self) -> Dict[str, Any]:
+        """叶节点检测使用的 BrowserContext 参数"""
+        return {
+            'user_agent': Settings.CRAWLER.get('playwright_user_agent', None),
+            'java_script_enabled': True,
+            'ignore_https_errors': True,
+            'bypass_csp': True,  # 绕过内容安全策略
+            'extra_http_headers': {'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8'}
+        }
+    
+    def _block_leaf_check_resources(self, context) -> None:
+        """在同步 context 上注册资源拦截"""
+        context.route(BLOCKED_ASSETS, lambda route: route.abort())
+        context.route(BLOCKED_TRACKERS, lambda route: route.abort())
+    
+    async def _block_leaf_check_resources_async(self, context) -> None:
+        """异步 context 的资源拦截注册"""
+        await context.route(BLOCKED_ASSETS, lambda route: route.abort())
+        await context.route(BLOCKED_TRACKERS, lambda route: route.abort())
+    
+    def _analyse_leaf_page_text(self, page_text: str, node_name: str, details_for_log: Dict) -> Tuple[bool, int]:
+        """根据页面文本判断叶节点并提取目标产品数 - 与 test-08 完全相同的逻辑（数字+results模式）"""
+        page_text = page_text or ''
+        
+        # 使用预编译正则检测"数字+results"模式
+        has_number_results = bool(NUMBER_RESULTS_PATTERN.search(page_text))
         
+        # 记录检测结果
+        details_for_log['has_number_results_pattern'] = has_number_results
+        
+        self.logger.debug(f"🔍 叶节点检测 [{node_name}]: 数字+results模式={'✅' if has_number_results else '❌'}")
+        
+        if not has_number_results:
+            self.logger.debug(f"⚠️ 这可能不是叶节点页面（未检测到数字+results模式）: {node_name}")
+            return False, 0
+        
+        # 有数字+results模式就是叶节点，并提取目标产品总数
+        self.logger.debug(f"✅ 确认这是一个叶节点页面（基于数字+results模式）: {node_name}")
+        return True, self._extract_target_product_count(page_text.lower())
+    
+    def _prepare_leaf_check(self, node: Dict) -> Tuple[str, str, Dict]:
+        """同步/异步检测共用的准备步骤：返回 (节点名, 增强URL, 日志详情)；节点无URL时增强URL为空串"""
+        node_name = node.get('name', 'UnknownNode')
         details_for_log = {
             'enhanced_url': '',
             'has_number_results_pattern': False,
         }
-
+        url = node.get('url')
         if not url:
             self.logger.debug(f"Node {node_name} has no URL.")
+            return node_name, '', details_for_log
+        
+        # 增强URL - 与 test-08 相同（PageSize=500）
+        enhanced_url = self._append_page_size(url, 500)
+        details_for_log['enhanced_url'] = enhanced_url
+        self.logger.debug(f"🔍 Playwright检测 [{node_name}]: {enhanced_url}")
+        return node_name, enhanced_url, details_for_log
+    
+    def _leaf_load_retry_delay(self, node_name: str, attempt: int, load_error: Exception) -> float:
+        """同步/异步检测共用的重试策略：还有重试机会时记录日志并返回等待秒数，否则抛出最后一次的异常"""
+        if attempt >= self.LEAF_CHECK_MAX_RETRIES:
+            raise load_error
+        self.logger.warning(f"⚠️ [{node_name}] 第{attempt+1}次加载失败，{self.LEAF_CHECK_RETRY_DELAY}秒后重试: {load_error}")
+        return self.LEAF_CHECK_RETRY_DELAY
+    
+    def _leaf_check_failed(self, node_name: str, enhanced_url: str, error: Exception, details_for_log: Dict) -> Tuple[bool, int, Dict]:
+        """同步/异步检测共用的失败处理：记录日志，结果记为非叶节点并附带错误信息"""
+        self.logger.warning(f"⚠️ Playwright页面处理失败 for [{node_name}] ({enhanced_url}): {error}", exc_info=self.debug_mode)
+        details_for_log['error'] = str(error)
+        return False, 0, details_for_log
+    
+    def _log_leaf_progress(self, processed_count: int, total: int) -> None:
+        """同步/异步批量检测共用的进度日志（每20个及最后一个输出一次）"""
+        if processed_count % 20 == 0 or processed_count == total:
+            self.logger.info(f"⏳ 叶节点检测进度: {processed_count}/{total} ({(processed_count/total)*100:.1f}%)")
+    
+    def _check_single_leaf_node(self, node: Dict) -> Tuple[bool, int, Dict]:
+        """单个叶节点检测（线程安全，独立浏览器），使用与 test-08 完全一致的 Playwright 逻辑"""
+        node_name, enhanced_url, details_for_log = self._prepare_leaf_check(node)
+        if not enhanced_url:
             return False, 0, details_for_log
         
         try:
-            from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
-            import time
-            import random
-            
-            # 增强URL - 与 test-08 相同
-            enhanced_url = self._append_page_size(url, 500)  # 使用与 test-08 相同的 PageSize=500
-            details_for_log['enhanced_url'] = enhanced_url
-            self.logger.debug(f"🔍 Playwright检测 [{node_name}]: {enhanced_url}")
+            from playwright.sync_api import sync_playwright
             
             with sync_playwright() as p:
-                browser = None
+                browser = p.chromium.launch(
+                    headless=Settings.CRAWLER.get('playwright_headless', True),
+                    args=self.LEAF_CHECK_LAUNCH_ARGS
+                )
                 try:
-                    browser = p.chromium.launch(
-                        headless=Settings.CRAWLER.get('playwright_headless', True),
-                        args=[
-                            '--no-sandbox',
-                            '--disable-dev-shm-usage',
-                            '--disable-web-security',
-                            '--disable-features=VizDisplayCompositor',
-                            '--disable-background-timer-throttling',
-                            '--disable-backgrounding-occluded-windows',
-                            '--disable-renderer-backgrounding'
-                        ]
-                    )
-                    context = browser.new_context(
-                        user_agent=Settings.CRAWLER.get('playwright_user_agent', None),
-                        java_script_enabled=True,
-                        ignore_https_errors=True,
-                        bypass_csp=True,  # 绕过内容安全策略
-                        extra_http_headers={'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8'}
-                    )
+                    context = browser.new_context(**self._leaf_check_context_options())
+                    self._block_leaf_check_resources(context)
                     page = context.new_page()
                     
-                    # 访问页面并等待网络空闲 - 添加重试机制和更灵活的等待策略
-                    max_retries = 2
-                    retry_delay = 3
-                    
-                    for attempt in range(max_retries + 1):
+                    for attempt in range(self.LEAF_CHECK_MAX_RETRIES + 1):
                         try:
-                            # 使用更宽松的超时设置和等待策略
-                            page.goto(enhanced_url, timeout=45000, wait_until='domcontentloaded')
-                            # 尝试等待网络空闲，但设置较短超时，失败则继续
+                            page.goto(enhanced_url, timeout=self.LEAF_CHECK_GOTO_TIMEOUT_MS, wait_until='domcontentloaded')
                             try:
-                                page.wait_for_load_state("networkidle", timeout=10000)
-                            except:
+                                page.wait_for_load_state("networkidle", timeout=self.LEAF_CHECK_NETWORKIDLE_TIMEOUT_MS)
+                            except Exception:
                                 self.logger.debug(f"⚠️ [{node_name}] 网络空闲等待超时，继续处理...")
-                            
-                            time.sleep(2)  # 等待页面稳定
-                            break  # 成功加载，退出重试循环
-                            
+                            time.sleep(self.LEAF_CHECK_SETTLE_SECONDS)  # 等待页面稳定
+                            break
                         except Exception as load_error:
-                            if attempt < max_retries:
-                                self.logger.warning(f"⚠️ [{node_name}] 第{attempt+1}次加载失败，{retry_delay}秒后重试: {load_error}")
-                                time.sleep(retry_delay)
-                                continue
-                            else:
-                                # 最后一次重试失败，抛出异常
-                                raise load_error
+                            time.sleep(self._leaf_load_retry_delay(node_name, attempt, load_error))
                     
-                    # 检测叶节点 - 与 test-08 完全相同的逻辑（简化为数字+results模式）
                     page_text = page.text_content("body")
-                    
-                    # 使用正则表达式检测"数字+results"模式
-                    # 支持逗号分隔的数字和不间断空格(\u00a0)
-                    import re
-                    results_pattern = r'\b[\d,]+(?:\s|\u00a0)+results?\b'
-                    has_number_results = bool(re.search(results_pattern, page_text, re.IGNORECASE))
-                    
-                    # 记录检测结果
-                    details_for_log['has_number_results_pattern'] = has_number_results
-                    
-                    self.logger.debug(f"🔍 叶节点检测 [{node_name}]: 数字+results模式={'✅' if has_number_results else '❌'}")
-                    
-                    # 提取目标产品总数
-                    target_count = 0
-                    if has_number_results:
-                        self.logger.debug(f"✅ 确认这是一个叶节点页面（基于数字+results模式）: {node_name}")
-                        target_count = self._extract_target_product_count_test08_style(page_text)
-                        
-                        # 最终叶节点判断逻辑：与 test-08 保持一致
-                        is_leaf = True  # 有数字+results模式就是叶节点
-                    else:
-                        self.logger.debug(f"⚠️ 这可能不是叶节点页面（未检测到数字+results模式）: {node_name}")
-                        is_leaf = False
-                    
+                    is_leaf, target_count = self._analyse_leaf_page_text(page_text, node_name, details_for_log)
                     return is_leaf, target_count, details_for_log
-                    
-                except Exception as pw_error:
-                    self.logger.warning(f"⚠️ Playwright页面处理失败 for [{node_name}] ({enhanced_url}): {pw_error}", exc_info=self.debug_mode)
-                    details_for_log['error'] = str(pw_error)
-                    return False, 0, details_for_log
                 finally:
-                    if browser:
-                        browser.close()
+                    browser.close()
                     
         except Exception as e:
-            self.logger.error(f"❌ Playwright检测严重失败 for [{node_name}] ({url}): {e}", exc_info=self.debug_mode)
-            details_for_log['error'] = str(e)
+            return self._leaf_check_failed(node_name, enhanced_url, e, details_for_log)
+    
+    def _verify_leaf_nodes_sync(self, nodes: List[Dict], max_workers: int) -> Dict[str, Tuple[bool, int, Dict]]:
+        """同步回退路径：工作线程中逐节点调用 _check_single_leaf_node（线程内无事件循环，可使用 sync Playwright）"""
+        results_map = {}
+        total = len(nodes)
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for processed_count, (node, result) in enumerate(zip(nodes, executor.map(self._check_single_leaf_node, nodes)), 1):
+                results_map[node['code']] = result
+                self._log_leaf_progress(processed_count, total)
+        return results_map
+    
+    async def _verify_leaf_nodes_async(self, nodes: List[Dict], max_concurrency: int) -> Dict[str, Tuple[bool, int, Dict]]:
+        """异步并发检测多个叶节点：共用一个浏览器，每个节点独立 context，Semaphore 限制并发数"""
+        from playwright.async_api import async_playwright
+        
+        results_map = {}
+        total = len(nodes)
+        processed_count = 0
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(
+                headless=Settings.CRAWLER.get('playwright_headless', True),
+                args=self.LEAF_CHECK_LAUNCH_ARGS
+            )
+            
+            async def process_node(node):
+                nonlocal processed_count
+                async with semaphore:
+                    results_map[node['code']] = await self._check_single_leaf_node_async(browser, node)
+                processed_count += 1
+                self._log_leaf_progress(processed_count, total)
+            
+            try:
+                await asyncio.gather(*(process_node(node) for node in nodes))
+            finally:
+                await browser.close()
+        
+        return results_map
+    
+    async def _check_single_leaf_node_async(self, browser, node: Dict) -> Tuple[bool, int, Dict]:
+        """单个叶节点检测（异步版本），在共享浏览器中使用独立 context；准备/重试/失败处理与同步版本共用"""
+        node_name, enhanced_url, details_for_log = self._prepare_leaf_check(node)
+        if not enhanced_url:
             return False, 0, details_for_log
+        
+        context = None
+        try:
+            context = await browser.new_context(**self._leaf_check_context_options())
+            await self._block_leaf_check_resources_async(context)
+            page = await context.new_page()
+            
+            for attempt in range(self.LEAF_CHECK_MAX_RETRIES + 1):
+                try:
+                    await page.goto(enhanced_url, timeout=self.LEAF_CHECK_GOTO_TIMEOUT_MS, wait_until='domcontentloaded')
+                    try:
+                        await page.wait_for_load_state("networkidle", timeout=self.LEAF_CHECK_NETWORKIDLE_TIMEOUT_MS)
+                    except Exception:
+                        self.logger.debug(f"⚠️ [{node_name}] 网络空闲等待超时，继续处理...")
+                    await asyncio.sleep(self.LEAF_CHECK_SETTLE_SECONDS)  # 等待页面稳定
+                    break
+                except Exception as load_error:
+                    await asyncio.sleep(self._leaf_load_retry_delay(node_name, attempt, load_error))
+            
+            page_text = await page.text_content("body")
+            is_leaf, target_count = self._analyse_leaf_page_text(page_text, node_name, details_for_log)
+            return is_leaf, target_count, details_for_log
+            
+        except Exception as pw_error:
+            return self._leaf_check_failed(node_name, enhanced_url, pw_error, details_for_log)
+        finally:
+            if context:
+                await context.close()
     
     def _check_if_real_leaf_node_batch(self, url: str) -> bool:
         """批量检测模式下的叶节点检测（复用driver）"""
@@ -625,41 +697,34 @@ class EnhancedClassificationCrawler:
             # 等待页面加载
             time.sleep(2)
             
-            # 获取页面文本内容
-            page_text = self.driver.page_source
+            # 获取页面文本内容（只取 body 文本；小写版本只计算一次）
+            page_text = self.driver.execute_script(self.BODY_TEXT_JS) or ""
+            page_text_lower = page_text.lower()
             
-            # 严格检查"数字 + results"模式，排除干扰
-            import re
-            # 修正的正则：匹配任意数字（可能带逗号分隔）+ 空格 + results
-            has_numbered_results = bool(re.search(r'\b\d{1,3}(?:,\d{3})*\s+results?\b|\b\d{4,}\s+results?\b', page_text, re.IGNORECASE))
+            # 检查是否有产品链接（干扰词校验也依赖此结果）
+            product_links = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='&Product=']")
+            has_product_links = len(product_links) > 0
+            
+            # 检查Sort by关键字（辅助判断）
+            has_sort_by = 'sort by' in page_text_lower
+            
+            # 严格检查"数字 + results"模式，排除干扰（正则均已预编译）
+            has_numbered_results = bool(self.STRICT_RESULTS_PATTERN.search(page_text))
             
             # 额外检查：排除"0 results"和干扰词
             if has_numbered_results:
                 # 排除0结果
-                if re.search(r'\b0\s+results?\b', page_text, re.IGNORECASE):
+                if self.ZERO_RESULTS_PATTERN.search(page_text):
                     has_numbered_results = False
                 else:
                     # 确保不是"search results"等干扰词
-                    interference_patterns = [
-                        r'search\s+\d+\s+results',
-                        r'filter\s+\d+\s+results', 
-                        r'found\s+\d+\s+results',
-                        r'showing\s+\d+\s+results'
-                    ]
-                    for pattern in interference_patterns:
-                        if re.search(pattern, page_text, re.IGNORECASE):
+                    for pattern in self.INTERFERENCE_PATTERNS:
+                        if pattern.search(page_text):
                             # 进一步验证是否真的是产品结果
                             if not (has_product_links or 'Sort by' in page_text):
                                 has_numbered_results = False
                                 break
             
-            # 检查是否有产品链接
-            product_links = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='&Product=']")
-            has_product_links = len(product_links) > 0
-            
-            # 检查Sort by关键字（辅助判断）
-            has_sort_by = 'Sort by' in page_text or 'sort by' in page_text.lower()
-            
             # 判断是否为叶节点：必须有数字+results 或 产品链接
             is_leaf = has_numbered_results or has_product_links
             
@@ -841,117 +906,44 @@ class EnhancedClassificationCrawler:
             return None, []
 
     # ----------------- 新增: 提取产品数量 -----------------
-    def _extract_target_product_count_test08_style(self, page_text: str) -> int:
-        """从页面提取目标产品总数 - 与 test-08 完全一致的逻辑"""
-        try:
-            # 常见的产品数量显示模式，支持逗号分隔符
-            count_patterns = [
-                r"([\d,]+)\s*results?",
-                r"([\d,]+)\s*products?", 
-                r"([\d,]+)\s*items?",
-                r"showing\s*[\d,]+\s*[-–]\s*[\d,]+\s*of\s*([\d,]+)",
-                r"([\d,]+)\s*total",
-                r"found\s*([\d,]+)"
-            ]
-            
-            # 获取页面全部文本内容并转为小写
-            page_text_lower = page_text.lower()
-            
-            self.logger.debug(f"🔍 搜索产品数量模式...")
-            
-            # 尝试匹配各种模式
-            for pattern in count_patterns:
-                if self.debug_mode:
-                    self.logger.debug(f"  📄 尝试模式: {pattern}")
-                matches = re.findall(pattern, page_text_lower, re.IGNORECASE)
-                if matches:
-                    if self.debug_mode:
-                        self.logger.debug(f"    🎉 模式 {pattern} 匹配到: {matches}")
-                    for match_item in matches:
-                        try:
-                            # re.findall 返回的是元组列表，即使只有一个捕获组
-                            # 如果是元组，取第一个元素；否则，直接使用
-                            actual_match_str = match_item if isinstance(match_item, str) else match_item[0]
-                            
-                            # 移除逗号后转换为整数
-                            count_str = actual_match_str.replace(',', '')
-                            if not count_str.isdigit(): # 确保是纯数字
-                                self.logger.warning(f"      ⚠️ 非数字内容: '{count_str}' (来自: '{actual_match_str}')")
-                                continue
-                            count = int(count_str)
-                            
-                            # 更新产品数量范围的下限为1，因为我们关心的是>0
-                            if 1 <= count <= 50000:  # 合理的产品数量范围
-                                self.logger.debug(f"🎯 发现目标产品总数: {count} (来自模式: '{pattern}', 原文: '{actual_match_str}')")
-                                return count
-                            else:
-                                if self.debug_mode:
-                                    self.logger.debug(f"      🔶 数量 {count} 不在有效范围 [1, 50000] (来自: '{actual_match_str}')")
-                        except (ValueError, IndexError) as e_inner:
-                            self.logger.warning(f"      ⚠️ 处理匹配项 '{match_item}' 时出错: {e_inner}")
-                            continue
-                else:
-                    if self.debug_mode:
-                        self.logger.debug(f"    ❌ 模式 {pattern} 未匹配到任何内容")
-            
-            self.logger.debug("⚠️ 未能提取到目标产品总数")
-            return 0
-            
-        except Exception as e:
-            self.logger.warning(f"⚠️ 提取目标产品总数失败: {e}")
-            return 0
-
     def _extract_target_product_count(self, page_text_lower: str) -> int:
         """从页面提取目标产品总数 - 严格对齐 test/08-test_leaf_product_links.py"""
         try:
-            # 常见的产品数量显示模式，支持逗号分隔符 (from test/08)
-            count_patterns = [
-                r"([\d,]+)\s*results?",
-                r"([\d,]+)\s*products?", 
-                r"([\d,]+)\s*items?",
-                r"showing\s*[\d,]+\s*[-–]\s*[\d,]+\s*of\s*([\d,]+)",
-                r"([\d,]+)\s*total",
-                r"found\s*([\d,]+)"
-            ]
-            
             self.logger.debug(f"🔍 [ClassEnhanced] 搜索产品数量模式...") 
             
-            for pattern in count_patterns:
+            for pattern in COUNT_PATTERNS:
                 if self.debug_mode: 
-                    self.logger.debug(f"  📄 [ClassEnhanced] 尝试模式: {pattern}")
+                    self.logger.debug(f"  📄 [ClassEnhanced] 尝试模式: {pattern.pattern}")
                 
-                matches = re.findall(pattern, page_text_lower, re.IGNORECASE)
-
-                if matches:
-                    if self.debug_mode: 
-                        self.logger.debug(f"    🎉 [ClassEnhanced] 模式 {pattern} 匹配到: {matches}")
-                    for match_item in matches:
-                        try:
-                            # 对齐 test-08 的简单逻辑：如果是元组，取第一个元素；否则，直接使用
-                            actual_match_str = match_item if isinstance(match_item, str) else match_item[0]
-                            
-                            # 移除逗号后转换为整数
-                            count_str = actual_match_str.replace(',', '')
-                            if not count_str.isdigit(): # 确保是纯数字
-                                if self.debug_mode:
-                                    self.logger.debug(f"      ⚠️ [ClassEnhanced] 非数字内容: '{count_str}' (来自: '{actual_match_str}')")
-                                continue
-                            count = int(count_str)
-                            
-                            # 合理的产品数量范围 (1 <= count <= 50000)
-                            if 1 <= count <= 50000:  
-                                self.logger.debug(f"🎯 [ClassEnhanced] 发现目标产品总数: {count} (来自模式: '{pattern}', 原文: '{actual_match_str}')")
-                                return count
-                            else:
-                                if self.debug_mode: 
-                                    self.logger.debug(f"      🔶 [ClassEnhanced] 数量 {count} 不在有效范围 [1, 50000] (来自: '{actual_match_str}')")
-                        except (ValueError, IndexError) as e_inner:
-                            if self.debug_mode: 
-                                self.logger.debug(f"      ⚠️ [ClassEnhanced] 处理匹配项 '{match_item}' 时出错: {e_inner}")
+                # finditer 惰性匹配：遇到第一个有效数量即返回，不必先收集全部匹配
+                matched_any = False
+                for match_obj in pattern.finditer(page_text_lower):
+                    matched_any = True
+                    match_item = match_obj.group(1)
+                    try:
+                        actual_match_str = match_item
+                        
+                        # 移除逗号后转换为整数
+                        count_str = actual_match_str.replace(',', '')
+                        if not count_str.isdigit(): # 确保是纯数字
+                            if self.debug_mode:
+                                self.logger.debug(f"      ⚠️ [ClassEnhanced] 非数字内容: '{count_str}' (来自: '{actual_match_str}')")
                             continue
-                else:
-                    if self.debug_mode: 
-                        self.logger.debug(f"    ❌ [ClassEnhanced] 模式 {pattern} 未匹配到任何内容")
+                        count = int(count_str)
+                        
+                        # 合理的产品数量范围 (1 <= count <= 50000)
+                        if 1 <= count <= 50000:  
+                            self.logger.debug(f"🎯 [ClassEnhanced] 发现目标产品总数: {count} (来自模式: '{pattern.pattern}', 原文: '{actual_match_str}')")
+                            return count
+                        else:
+                            if self.debug_mode: 
+                                self.logger.debug(f"      🔶 [ClassEnhanced] 数量 {count} 不在有效范围 [1, 50000] (来自: '{actual_match_str}')")
+                    except (ValueError, IndexError) as e_inner:
+                        if self.debug_mode: 
+                            self.logger.debug(f"      ⚠️ [ClassEnhanced] 处理匹配项 '{match_item}' 时出错: {e_inner}")
+                        continue
+                if not matched_any and self.debug_mode:
+                    self.logger.debug(f"    ❌ [ClassEnhanced] 模式 {pattern.pattern} 未匹配到任何内容")
             
             self.logger.debug("⚠️ [ClassEnhanced] 未能提取到目标产品总数")
             return 0
@@ -983,7 +975,7 @@ class EnhancedClassificationCrawler:
         # Get max_workers from settings, similar to how it's done elsewhere.
         # Ensure Settings is accessible here. If not, a default or passed param is needed.
         # Assuming Settings class is available (it's used above for playwright_headless etc.)
-        max_workers_for_verification = Settings.CRAWLER.get('classification_workers', 16)
+        max_workers_for_verification = Settings.CRAWLER.get('classification_max_workers', 16)
         
         verified_tree_data = self.verify_leaf_nodes(tree_data, max_workers=max_workers_for_verification)
         self.logger.info("🧐 Leaf node verification complete.")
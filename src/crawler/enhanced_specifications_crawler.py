@@ -8,6 +8,7 @@
 
 import time
 import logging
+import threading
 from typing import List, Dict, Any, Optional
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -37,6 +38,11 @@ class EnhancedSpecificationsCrawler:
         self.anti_detection = AntiDetectionManager(self.logger)
         self.thread_pool = SmartThreadPool(max_workers, self.logger)
         
+        # 单产品接口的线程本地driver：同一线程内复用，避免每个产品重启Chrome
+        self.thread_local = threading.local()
+        self._thread_drivers = []
+        self._thread_drivers_lock = threading.Lock()
+        
         # 统计信息
         self.stats = {
             'total_processed': 0,
@@ -206,25 +212,13 @@ class EnhancedSpecificationsCrawler:
             # 应用请求限流（同步版本）
             self.anti_detection.apply_request_throttling(vendor)
             
-            # 创建临时driver（简单同步模式）
-            from selenium.webdriver.chrome.options import Options
-            options = Options()
-            options.add_argument('--headless')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--window-size=1920,1080')
-            options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-            
-            driver = webdriver.Chrome(options=options)
+            # 获取当前线程复用的driver（简单同步模式）
+            driver, waiter = self._get_thread_driver()
             
             try:
                 # 访问页面
                 driver.get(product_url)
                 
-                # 创建临时waiter
-                waiter = SmartWaiter(driver, self.logger)
-                
                 # 智能等待页面就绪
                 page_ready = waiter.wait_for_page_ready(vendor)
                 if not page_ready:
@@ -260,8 +254,10 @@ class EnhancedSpecificationsCrawler:
                     'extraction_method': 'enhanced_adaptive_sync'
                 }
                 
-            finally:
-                driver.quit()
+            except Exception:
+                # driver 可能已失效，丢弃后下次调用重新创建
+                self._discard_thread_driver()
+                raise
                 
         except Exception as e:
             self.logger.error(f"❌ 单产品处理异常: {product_url} - {e}")
@@ -274,6 +270,54 @@ class EnhancedSpecificationsCrawler:
                 'vendor': self.anti_detection.detect_vendor_from_url(product_url)
             }
     
+    def _get_thread_driver(self):
+        """获取当前线程的driver和waiter，首次调用时创建"""
+        if getattr(self.thread_local, 'driver', None) is None:
+            from selenium.webdriver.chrome.options import Options
+            options = Options()
+            options.add_argument('--headless')
+            options.add_argument('--no-sandbox')
+            options.add_argument('--disable-dev-shm-usage')
+            options.add_argument('--disable-gpu')
+            options.add_argument('--window-size=1920,1080')
+            options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+            
+            driver = webdriver.Chrome(options=options)
+            self.thread_local.driver = driver
+            self.thread_local.waiter = SmartWaiter(driver, self.logger)
+            with self._thread_drivers_lock:
+                self._thread_drivers.append(driver)
+            self.logger.debug("🔧 为线程创建规格提取driver")
+        
+        return self.thread_local.driver, self.thread_local.waiter
+    
+    def _discard_thread_driver(self):
+        """关闭并丢弃当前线程的driver"""
+        driver = getattr(self.thread_local, 'driver', None)
+        if driver is None:
+            return
+        self.thread_local.driver = None
+        self.thread_local.waiter = None
+        with self._thread_drivers_lock:
+            if driver in self._thread_drivers:
+                self._thread_drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+    
+    def close_drivers(self):
+        """关闭单产品接口创建的所有线程driver"""
+        with self._thread_drivers_lock:
+            drivers, self._thread_drivers = self._thread_drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                self.logger.debug(f"关闭driver失败: {e}")
+        # 创建这些driver的线程可能仍存活（如复用的线程池），标记为失效以便重新创建
+        self.thread_local = threading.local()
+    
     def get_performance_summary(self) -> Dict[str, Any]:
         """获取性能摘要"""
         pool_stats = self.thread_pool.get_performance_stats()
@@ -287,6 +331,7 @@ class EnhancedSpecificationsCrawler:
     def close(self):
         """关闭爬取器"""
         self.logger.info("🛑 关闭增强版规格爬取器...")
+        self.close_drivers()
         self.thread_pool.shutdown()
     
     def __enter__(self):
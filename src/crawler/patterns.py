@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+爬虫共用的匹配规则
+==============
+分类树叶节点检测与产品链接爬取共用同一套规则，避免两处检测逻辑各自演变
+"""
+
+import re
+
+# 产品数量提取正则（模块加载时编译一次，按优先级排列）
+COUNT_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r"([\d,]+)\s*results?",
+    r"([\d,]+)\s*products?",
+    r"([\d,]+)\s*items?",
+    r"showing\s*[\d,]+\s*[-–]\s*[\d,]+\s*of\s*([\d,]+)",
+    r"([\d,]+)\s*total",
+    r"found\s*([\d,]+)"
+)]
+
+# 叶节点判定："数字+results" 模式，支持逗号分隔数字和不间断空格(\u00a0)
+NUMBER_RESULTS_PATTERN = re.compile(r'\b[\d,]+(?:\s|\u00a0)+results?\b', re.IGNORECASE)
+
+# Playwright 页面拦截的资源：图片/字体/媒体及第三方统计（保留CSS以免布局异常）
+BLOCKED_ASSETS = "**/*.{png,jpg,jpeg,gif,webp,svg,ico,mp4,webm,woff,woff2,ttf,otf}"
+BLOCKED_TRACKERS = re.compile(r"(doubleclick|googletagmanager|google-analytics|facebook)")
@@ -13,6 +13,8 @@
 
 import re
 import os
+import json
+import math
 import sys
 import time
 import random
@@ -26,10 +28,75 @@ from pathlib import Path
 # Playwright
 from playwright.sync_api import Playwright, sync_playwright, Page, BrowserContext, Browser
 
+# 导入配置
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from config.settings import Settings
+from src.crawler.patterns import COUNT_PATTERNS, NUMBER_RESULTS_PATTERN, BLOCKED_ASSETS, BLOCKED_TRACKERS
+
 
 class UltimateProductLinksCrawlerV2:
     """终极产品链接爬取器 v2 - 集成test-08所有优化策略"""
     
+    # 产品链接选择器
+    PRODUCT_LINK_SELECTOR = "a[href*='&Product=']"
+
+    # 动态加载的stealth模块在sys.modules中的名称
+    STEALTH_MODULE_NAME = "stealth11i"
+
+    # 人类行为延迟的最小中位数（秒），避免 min_delay=0 时 log(0)
+    MIN_DELAY_MEDIAN = 0.05
+
+    # 页面默认超时（毫秒）：元素等待/操作 与 页面导航
+    DEFAULT_TIMEOUT_MS = 15000
+    NAVIGATION_TIMEOUT_MS = 60000
+    
+    # 分页相关词汇（小写）及浏览器内匹配脚本：返回首个命中的关键词，无则返回 null
+    PAGINATION_KEYWORDS = [
+        "show more", "load more", "more results", "next page",
+        "下一页", "加载更多", "显示更多"
+    ]
+    FIND_PAGINATION_KEYWORD_JS = """
+        keywords => {
+            const text = (document.body ? document.body.textContent : '').toLowerCase();
+            return keywords.find(k => text.includes(k)) || null;
+        }
+    """
+    
+    # 叶节点页面就绪判定：已有产品链接，或正文出现 "数字+results" 结果数（与 NUMBER_RESULTS_PATTERN 一致）
+    LEAF_READY_JS = """
+        ([sel, pattern]) => !!document.querySelector(sel) ||
+            new RegExp(pattern, 'i').test(document.body ? document.body.textContent : '')
+    """
+    LEAF_READY_POLL_MS = 200
+    
+    # 批量描述按钮状态的脚本（text/visible/enabled 一次返回）
+    DESCRIBE_BUTTONS_JS = """
+        els => els.map(e => ({
+            text: e.textContent || '',
+            visible: !!(e.offsetWidth || e.offsetHeight || e.getClientRects().length),
+            enabled: !e.disabled
+        }))
+    """
+    
+    # 分页迹象检测 / Show More点击共用的合并选择器（预先拼接，单次查询代替逐个 query_selector）
+    SHOW_MORE_SELECTORS = [
+        "button:has-text('Show more')", "button:has-text('Show More')",
+        "button:has-text('Load more')", "button:has-text('More results')",
+        "a:has-text('Show more')", ".show-more", ".load-more",
+        "button[class*='show-more']", "button[class*='load-more']"
+    ]
+    SHOW_MORE_SIGN_SELECTOR = ", ".join(SHOW_MORE_SELECTORS)
+    # 点击时每个分支都排除禁用元素，避免文档顺序靠前的禁用按钮挡住后面可用的候选
+    SHOW_MORE_CLICKABLE_SELECTOR = ", ".join(
+        f"{sel}:not([disabled]):not([aria-disabled='true'])" for sel in SHOW_MORE_SELECTORS
+    )
+    PAGINATION_SIGN_SELECTOR = ", ".join([
+        ".pagination", ".pager", ".page-nav",
+        "a:has-text('Next')", "a:has-text('下一页')",
+        "button:has-text('Next')", "button:has-text('下一页')",
+        "[class*='page']", "[class*='next']"
+    ])
+    
     def __init__(self, log_level: int = logging.INFO, headless: bool = True, debug_mode: bool = False):
         """
         初始化终极产品链接爬取器 v2
@@ -60,6 +127,13 @@ class UltimateProductLinksCrawlerV2:
         # Playwright instance management
         self.playwright_instance: Optional[Playwright] = None
         self._created_playwright_internally = False
+        
+        # 登录成功后的会话状态（cookies），供后续叶节点及下次运行复用
+        self._session_file = Path(Settings.AUTH['session_file'])
+        self._login_storage_state: Optional[Dict[str, Any]] = self._load_session_state()
+        
+        # 内部共享的标准浏览器（无stealth模块时使用），各叶节点仅新建 context
+        self._shared_browser: Optional[Browser] = None
 
     def _ensure_playwright_running(self) -> Playwright:
         if self.playwright_instance is None:
@@ -68,8 +142,19 @@ class UltimateProductLinksCrawlerV2:
             self.logger.info("Playwright started internally by UltimateProductLinksCrawlerV2.")
         return self.playwright_instance
 
+    def _get_shared_browser(self, p: Playwright) -> Browser:
+        """获取共享的标准浏览器，首次调用时启动，之后复用以省去每个叶节点的 Chromium 启动开销"""
+        if self._shared_browser is None or not self._shared_browser.is_connected():
+            self._shared_browser = p.chromium.launch(headless=self.headless)
+            self.logger.info("🌐 已启动共享浏览器，后续叶节点复用")
+        return self._shared_browser
+
     def _load_stealth_module(self) -> Optional[Any]:
-        """动态加载stealth11i模块"""
+        """动态加载stealth11i模块（加载后登记到sys.modules，同进程内的后续实例直接复用）"""
+        cached = sys.modules.get(self.STEALTH_MODULE_NAME)
+        if cached is not None:
+            return cached
+
         try:
             BASE_DIR = Path(__file__).parent.parent.parent
             path_to_11i = BASE_DIR / "test" / "legacy" / "11i-stealth_cad_downloader.py"
@@ -78,13 +163,14 @@ class UltimateProductLinksCrawlerV2:
                 self.logger.warning(f"⚠️ Stealth module not found at: {path_to_11i}. Proceeding without stealth login capabilities.")
                 return None
             
-            MOD11 = importlib.util.spec_from_file_location("stealth11i", str(path_to_11i))
+            MOD11 = importlib.util.spec_from_file_location(self.STEALTH_MODULE_NAME, str(path_to_11i))
             if MOD11 is None or MOD11.loader is None:
                 self.logger.error(f"❌ Failed to create module spec for stealth11i from {path_to_11i}")
                 return None
 
             stealth_module = importlib.util.module_from_spec(MOD11)
             MOD11.loader.exec_module(stealth_module)
+            sys.modules[self.STEALTH_MODULE_NAME] = stealth_module
             self.logger.info("✅ stealth模块加载成功 (for optional login)")
             return stealth_module
             
@@ -92,27 +178,28 @@ class UltimateProductLinksCrawlerV2:
             self.logger.error(f"❌ 加载stealth模块失败: {e}", exc_info=self.debug_mode)
             return None
 
-    def human_like_delay(self, min_delay=0.5, max_delay=2.0):
-        """人类行为延迟"""
-        delay = random.uniform(min_delay, max_delay)
+    def human_like_delay(self, min_delay=0.5, max_delay=2.0, sigma=0.5) -> float:
+        """人类行为延迟：对数正态分布采样（中位数取区间几何均值），多数停顿较短、偶有长停顿，再截断到区间内；返回实际休眠秒数"""
+        # 下限为0时几何均值为0，log 无定义，中位数至少取一个很小的正值
+        median = max(math.sqrt(min_delay * max_delay), self.MIN_DELAY_MEDIAN)
+        delay = min(max(random.lognormvariate(math.log(median), sigma), min_delay), max_delay)
         time.sleep(delay)
+        return delay
 
     def detect_leaf_node_and_target_count(self, page: Page) -> Tuple[bool, int]:
         """检测是否为叶节点并获取目标产品总数 - 使用简化的数字+results模式"""
         try:
             page_text = page.text_content("body")
             
-            # 使用正则表达式检测"数字+results"模式
-            # 支持逗号分隔的数字和不间断空格(\u00a0)
-            import re
-            results_pattern = r'\b[\d,]+(?:\s|\u00a0)+results?\b'
-            has_number_results = bool(re.search(results_pattern, page_text, re.IGNORECASE))
+            # 使用预编译正则检测"数字+results"模式
+            has_number_results = bool(NUMBER_RESULTS_PATTERN.search(page_text))
             
             self.logger.info(f"🔍 叶节点检测 (来自test-08逻辑): 数字+results模式={'✅' if has_number_results else '❌'}")
             
             if has_number_results:
                 self.logger.info("✅ 确认这是一个叶节点页面（基于数字+results模式）")
-                target_count = self.extract_target_product_count(page)
+                # 复用已读取的 body 文本，避免再次序列化整个 DOM
+                target_count = self.extract_target_product_count(page, page_text=page_text)
                 return True, target_count
             else:
                 self.logger.warning("⚠️ 这可能不是叶节点页面（未检测到数字+results模式）")
@@ -122,49 +209,42 @@ class UltimateProductLinksCrawlerV2:
             self.logger.warning(f"⚠️ 叶节点检测失败: {e}", exc_info=self.debug_mode)
             return False, 0
 
-    def extract_target_product_count(self, page: Page) -> int:
-        """从页面提取目标产品总数"""
+    def extract_target_product_count(self, page: Page, page_text: Optional[str] = None) -> int:
+        """从页面提取目标产品总数（调用方已读取 body 文本时可直接传入 page_text）"""
         try:
-            count_patterns = [
-                r"([\d,]+)\s*results?",
-                r"([\d,]+)\s*products?", 
-                r"([\d,]+)\s*items?",
-                r"showing\s*[\d,]+\s*[-–]\s*[\d,]+\s*of\s*([\d,]+)",
-                r"([\d,]+)\s*total",
-                r"found\s*([\d,]+)"
-            ]
-            page_text = page.text_content("body").lower()
+            if page_text is None:
+                page_text = page.text_content("body")
+            page_text = page_text.lower()
             
             self.logger.info(f"🔍 搜索产品数量模式...")
             
-            for pattern in count_patterns:
+            for pattern in COUNT_PATTERNS:
                 if self.debug_mode:
-                    self.logger.info(f"  📄 尝试模式: {pattern}")
-                matches = re.findall(pattern, page_text, re.IGNORECASE)
-                if matches:
-                    if self.debug_mode:
-                        self.logger.info(f"    🎉 模式 {pattern} 匹配到: {matches}")
-                    for match_item in matches:
-                        try:
-                            actual_match_str = match_item if isinstance(match_item, str) else match_item[0]
-                            count_str = actual_match_str.replace(',', '')
-                            if not count_str.isdigit():
-                                if self.debug_mode:
-                                    self.logger.warning(f"      ⚠️ 非数字内容: '{count_str}' (来自: '{actual_match_str}')")
-                                continue
-                            count = int(count_str)
-                            if 1 <= count <= 50000:
-                                self.logger.info(f"🎯 发现目标产品总数: {count} (来自模式: '{pattern}', 原文: '{actual_match_str}')")
-                                return count
-                            else:
-                                if self.debug_mode:
-                                    self.logger.info(f"      🔶 数量 {count} 不在有效范围 [1, 50000] (来自: '{actual_match_str}')")
-                        except (ValueError, IndexError) as e_inner:
-                            self.logger.warning(f"      ⚠️ 处理匹配项 '{match_item}' 时出错: {e_inner}", exc_info=self.debug_mode)
+                    self.logger.info(f"  📄 尝试模式: {pattern.pattern}")
+                # finditer 惰性匹配：遇到第一个有效数量即返回，不必先收集全部匹配
+                matched_any = False
+                for match_obj in pattern.finditer(page_text):
+                    matched_any = True
+                    match_item = match_obj.group(1)
+                    try:
+                        actual_match_str = match_item
+                        count_str = actual_match_str.replace(',', '')
+                        if not count_str.isdigit():
+                            if self.debug_mode:
+                                self.logger.warning(f"      ⚠️ 非数字内容: '{count_str}' (来自: '{actual_match_str}')")
                             continue
-                else:
-                    if self.debug_mode:
-                        self.logger.info(f"    ❌ 模式 {pattern} 未匹配到任何内容")
+                        count = int(count_str)
+                        if 1 <= count <= 50000:
+                            self.logger.info(f"🎯 发现目标产品总数: {count} (来自模式: '{pattern.pattern}', 原文: '{actual_match_str}')")
+                            return count
+                        else:
+                            if self.debug_mode:
+                                self.logger.info(f"      🔶 数量 {count} 不在有效范围 [1, 50000] (来自: '{actual_match_str}')")
+                    except (ValueError, IndexError) as e_inner:
+                        self.logger.warning(f"      ⚠️ 处理匹配项 '{match_item}' 时出错: {e_inner}", exc_info=self.debug_mode)
+                        continue
+                if not matched_any and self.debug_mode:
+                    self.logger.info(f"    ❌ 模式 {pattern.pattern} 未匹配到任何内容")
             
             self.logger.info("⚠️ 未能提取到目标产品总数")
             return 0
@@ -203,29 +283,29 @@ class UltimateProductLinksCrawlerV2:
                 self.logger.info(f"  📜 滚动步骤 {step + 1}/{scroll_steps}")
             
             current_progress = (current_products / target_count * 100) if target_count > 0 else 50
-            wait_time = random.uniform(0.3, 0.8) if current_progress < 80 else random.uniform(0.5, 1.2)
-            time.sleep(wait_time)
+            wait_range = (0.3, 0.8) if current_progress < 80 else (0.5, 1.2)
+            self.human_like_delay(*wait_range)
             
             if random.random() < 0.3:
                 back_scroll = random.randint(20, 100)
                 page.evaluate(f"window.scrollBy(0, -{back_scroll});")
                 if self.debug_mode:
                     self.logger.info(f"  🔙 随机回滚 {back_scroll}px")
-                time.sleep(random.uniform(0.3, 0.8))
+                self.human_like_delay(0.3, 0.8)
                 page.evaluate(f"window.scrollBy(0, {back_scroll + 20});")
         
         page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-        final_wait = random.uniform(0.8, 1.5)
-        time.sleep(final_wait)
+        final_wait = self.human_like_delay(0.8, 1.5)
         if self.debug_mode:
             self.logger.info(f"📜 滚动完成，最终等待 {final_wait:.1f}s")
 
     def extract_products_on_page(self, page: Page, seen_links: set) -> List[str]:
         """提取当前页面所有含 &Product= 的 a 标签链接，去重"""
-        elements = page.query_selector_all("a[href*='&Product=']")
+        # 一次 evaluate 取回全部 href，避免每个元素单独 get_attribute 往返
+        hrefs = page.eval_on_selector_all(self.PRODUCT_LINK_SELECTOR, "els => els.map(e => e.getAttribute('href'))")
         links = []
-        for el in elements:
-            href = el.get_attribute('href') or ""
+        for href in hrefs:
+            href = href or ""
             if not href or href in seen_links:
                 continue
             if '&Product=' not in href:
@@ -247,83 +327,64 @@ class UltimateProductLinksCrawlerV2:
     def click_show_more_if_any(self, page: Page, target_count: int = 0) -> bool:
         """若页面存在 'Show more results' 按钮，则点击并返回 True"""
         try:
-            all_buttons = page.query_selector_all("button")
+            # 按钮扫描结果只用于调试日志，非调试模式下跳过这次 evaluate 及逐按钮格式化
             if self.debug_mode:
+                # 一次 evaluate 取回所有按钮的文本/可见/可用状态，避免逐元素多次往返
+                all_buttons = page.eval_on_selector_all("button", self.DESCRIBE_BUTTONS_JS)
                 self.logger.info(f"🔍 页面共有 {len(all_buttons)} 个按钮")
-            
-            show_more_buttons_details = []
-            for i, btn_el in enumerate(all_buttons):
-                try:
-                    btn_text = (btn_el.text_content() or "").lower()
-                    if self.debug_mode and btn_text:
-                         pass
+                
+                show_more_buttons_details = []
+                for i, btn_info in enumerate(all_buttons):
+                    btn_text = (btn_info.get('text') or "").lower()
                     if 'show' in btn_text and 'more' in btn_text:
-                        show_more_buttons_details.append({'index': i, 'element': btn_el, 'text': btn_text})
-                        if self.debug_mode:
-                           self.logger.info(f"🎯 候选Show More按钮 {i}: '{btn_text}' (visible: {btn_el.is_visible()}, enabled: {btn_el.is_enabled()})")
-                except Exception:
-                    continue
-            
-            if self.debug_mode:
+                        show_more_buttons_details.append({'index': i, 'text': btn_text})
+                        self.logger.info(f"🎯 候选Show More按钮 {i}: '{btn_text}' (visible: {btn_info.get('visible')}, enabled: {btn_info.get('enabled')})")
+                
                 self.logger.info(f"🎯 总共找到 {len(show_more_buttons_details)} 个候选Show More按钮")
             
-            btn_to_click = None
-            selectors = [
-                "button:has-text('Show more')", "button:has-text('Show More')", 
-                "button:has-text('Load more')", "button:has-text('More results')",
-                "a:has-text('Show more')", ".show-more, .load-more",
-                "button[class*='show-more'], button[class*='load-more']"
-            ]
-            
-            for selector in selectors:
-                try:
-                    btn_to_click = page.query_selector(selector)
-                    if btn_to_click and btn_to_click.is_visible() and btn_to_click.is_enabled():
-                        self.logger.info(f"✅ 使用选择器找到按钮: {selector}")
-                        break
-                    btn_to_click = None
-                except Exception:
-                    btn_to_click = None
-                    continue
-            
-            if not btn_to_click:
-                self.logger.info("❌ 所有选择器都未找到可点击的Show More按钮")
+            # 合并选择器 + 可见过滤，由浏览器端一次完成候选查找，代替逐个 query_selector 往返
+            btn_to_click = page.locator(f"{self.SHOW_MORE_CLICKABLE_SELECTOR} >> visible=true").first
+            if btn_to_click.count() == 0 or not btn_to_click.is_enabled():
+                self.logger.info("❌ 未找到可点击的Show More按钮")
                 return False
 
-            self.logger.info(f"👆 找到可点击的Show More按钮: '{btn_to_click.text_content()}'")
+            # Locator 每次调用都会重新解析；按钮文本在点击前读取一次，异常分支只记录该文本，
+            # 避免按钮已脱离/禁用时再次解析阻塞到默认超时、导致JS点击回退无法执行
+            label = btn_to_click.text_content(timeout=1000)
+            self.logger.info(f"👆 找到可点击的Show More按钮: '{label}'")
             btn_to_click.scroll_into_view_if_needed()
-            time.sleep(random.uniform(0.5, 1.0))
+            self.human_like_delay(0.5, 1.0)
             
             try:
                 btn_to_click.click(timeout=5000)
                 self.logger.info("✅ 普通点击成功")
             except Exception as e_click:
-                self.logger.warning(f"⚠️ 普通点击失败 ('{btn_to_click.text_content()}'): {e_click}，尝试JS点击")
+                self.logger.warning(f"⚠️ 普通点击失败 ('{label}'): {e_click}，尝试JS点击")
                 try:
-                    page.evaluate("arguments[0].click();", btn_to_click)
+                    btn_to_click.evaluate("el => el.click()", timeout=5000)
                     self.logger.info("✅ JavaScript点击成功")
                 except Exception as e_js_click:
-                    self.logger.error(f"❌ JS点击也失败 ('{btn_to_click.text_content()}'): {e_js_click}")
+                    self.logger.error(f"❌ JS点击也失败 ('{label}'): {e_js_click}")
                     return False
 
-            current_after_click = len(page.query_selector_all("a[href*='&Product=']"))
+            current_after_click = page.locator(self.PRODUCT_LINK_SELECTOR).count()
             progress_after_click = (current_after_click / target_count * 100) if target_count > 0 else 50
             
-            post_click_wait = random.uniform(0.2, 0.5) if progress_after_click < 80 else random.uniform(0.4, 0.8)
+            post_click_range = (0.2, 0.5) if progress_after_click < 80 else (0.4, 0.8)
             up_scroll_prob = 0.3 if progress_after_click < 80 else 0.5
-            final_wait_after_scroll = random.uniform(0.4, 0.8) if progress_after_click < 80 else random.uniform(0.8, 1.5)
+            final_wait_range = (0.4, 0.8) if progress_after_click < 80 else (0.8, 1.5)
                 
-            time.sleep(post_click_wait)
+            self.human_like_delay(*post_click_range)
             
             if random.random() < up_scroll_prob:
                 up_scroll = random.randint(80, 150)
                 page.evaluate(f"window.scrollBy(0, -{up_scroll});")
                 if self.debug_mode:
                      self.logger.info(f"  👀 随机上滚查看 {up_scroll}px")
-                time.sleep(random.uniform(0.1, 0.3))
+                self.human_like_delay(0.1, 0.3)
             
             page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(final_wait_after_scroll)
+            self.human_like_delay(*final_wait_range)
             return True
             
         except Exception as e:
@@ -334,51 +395,21 @@ class UltimateProductLinksCrawlerV2:
     def _check_pagination_signs(self, page: Page) -> bool:
         """检查页面是否有分页或Show More的迹象"""
         try:
-            # 检查是否有Show More相关按钮
-            show_more_selectors = [
-                "button:has-text('Show more')", "button:has-text('Show More')", 
-                "button:has-text('Load more')", "button:has-text('More results')",
-                "a:has-text('Show more')", ".show-more", ".load-more",
-                "button[class*='show-more']", "button[class*='load-more']"
-            ]
-            
-            for selector in show_more_selectors:
-                try:
-                    element = page.query_selector(selector)
-                    if element and element.is_visible():
-                        self.logger.info(f"✅ 发现分页迹象：Show More按钮 ({selector})")
-                        return True
-                except:
-                    continue
+            # 检查是否有Show More相关按钮（合并选择器，一次查询）
+            if page.locator(f"{self.SHOW_MORE_SIGN_SELECTOR} >> visible=true").count() > 0:
+                self.logger.info("✅ 发现分页迹象：Show More按钮")
+                return True
             
             # 检查是否有分页相关元素
-            pagination_selectors = [
-                ".pagination", ".pager", ".page-nav",
-                "a:has-text('Next')", "a:has-text('下一页')",
-                "button:has-text('Next')", "button:has-text('下一页')",
-                "[class*='page']", "[class*='next']"
-            ]
-            
-            for selector in pagination_selectors:
-                try:
-                    element = page.query_selector(selector)
-                    if element and element.is_visible():
-                        self.logger.info(f"✅ 发现分页迹象：分页元素 ({selector})")
-                        return True
-                except:
-                    continue
-            
-            # 检查页面文本是否包含分页相关词汇
-            page_text = page.text_content("body").lower()
-            pagination_keywords = [
-                "show more", "load more", "more results", "next page", 
-                "下一页", "加载更多", "显示更多"
-            ]
+            if page.locator(f"{self.PAGINATION_SIGN_SELECTOR} >> visible=true").count() > 0:
+                self.logger.info("✅ 发现分页迹象：分页元素")
+                return True
             
-            for keyword in pagination_keywords:
-                if keyword in page_text:
-                    self.logger.info(f"✅ 发现分页迹象：关键词 '{keyword}'")
-                    return True
+            # 检查页面文本是否包含分页相关词汇（在浏览器内匹配，不必把整页文本传回 Python）
+            keyword = page.evaluate(self.FIND_PAGINATION_KEYWORD_JS, self.PAGINATION_KEYWORDS)
+            if keyword:
+                self.logger.info(f"✅ 发现分页迹象：关键词 '{keyword}'")
+                return True
             
             self.logger.info("❌ 未发现明显的分页迹象")
             return False
@@ -387,11 +418,26 @@ class UltimateProductLinksCrawlerV2:
             self.logger.warning(f"⚠️ 检查分页迹象时出错: {e}")
             return False  # 出错时保守处理，认为没有分页
 
+    def _wait_for_product_growth(self, page: Page, baseline: int, timeout_ms: int = 3500) -> bool:
+        """等待产品链接数量超过 baseline；有新增立即返回 True，超时返回 False（替代固定 sleep）"""
+        try:
+            page.wait_for_function(
+                "([sel, n]) => document.querySelectorAll(sel).length > n",
+                arg=[self.PRODUCT_LINK_SELECTOR, baseline],
+                timeout=timeout_ms
+            )
+            return True
+        except Exception:
+            return False
+
     def load_all_results(self, page: Page, target_count: int = 0):
         """持续滚动并点击 'Show more results'，直到全部产品都加载完"""
         
+        # 产品链接 Locator 只构建一次，后续计数直接复用
+        product_links = page.locator(self.PRODUCT_LINK_SELECTOR)
+        
         # 早期检查：如果没有目标数量且初始产品很少，快速判断是否需要加载更多
-        initial_products = len(page.query_selector_all("a[href*='&Product=']"))
+        initial_products = product_links.count()
         
         # 检查页面是否有分页或Show More的迹象
         has_pagination_signs = self._check_pagination_signs(page)
@@ -421,7 +467,7 @@ class UltimateProductLinksCrawlerV2:
                no_product_change_rounds < max_no_product_change and
                consecutive_click_failures < MAX_CONSECUTIVE_CLICK_FAILURES):
             
-            current_products_on_page = len(page.query_selector_all("a[href*='&Product=']"))
+            current_products_on_page = product_links.count()
             loop_round_name = f"主循环第 {attempt_count + 1}/{max_attempts} 轮"
             self.monitor_progress(current_products_on_page, target_count, loop_round_name)
             
@@ -441,14 +487,14 @@ class UltimateProductLinksCrawlerV2:
                 if current_progress_percent < 95.0:
                     if self.debug_mode:
                         self.logger.info(f"⚡ 当前进度 {current_progress_percent:.1f}% < 95%，尝试快速点击/滚动...")
-                    time.sleep(random.uniform(0.5, 1.5))
+                    self.human_like_delay(0.5, 1.5)
                     
                     clicked_in_fast_retry = self.click_show_more_if_any(page, target_count)
                     attempt_count += 1
 
                     if clicked_in_fast_retry:
                         consecutive_click_failures = 0
-                        after_quick_click_products = len(page.query_selector_all("a[href*='&Product=']"))
+                        after_quick_click_products = product_links.count()
                         if after_quick_click_products > current_products_on_page:
                             no_product_change_rounds = 0
                             if self.debug_mode:
@@ -477,7 +523,7 @@ class UltimateProductLinksCrawlerV2:
 
             if clicked_this_round:
                 consecutive_click_failures = 0
-                after_std_click_products = len(page.query_selector_all("a[href*='&Product=']"))
+                after_std_click_products = product_links.count()
                 self.monitor_progress(after_std_click_products, target_count, loop_round_name)
                 
                 if after_std_click_products == current_products_on_page:
@@ -520,16 +566,18 @@ class UltimateProductLinksCrawlerV2:
         consecutive_no_button_final = 0
 
         for final_scroll_iter in range(final_scroll_rounds_count):
-            before_final_scroll_products = len(page.query_selector_all("a[href*='&Product=']"))
+            before_final_scroll_products = product_links.count()
             final_round_name = f"最终确认第 {final_scroll_iter + 1}/{final_scroll_rounds_count} 轮"
             self.monitor_progress(before_final_scroll_products, target_count, final_round_name)
             if self.debug_mode:
                  self.logger.info(f"📊 {final_round_name} 开始，当前产品数: {before_final_scroll_products}")
             
             self.scroll_full(page, before_final_scroll_products, target_count)
-            time.sleep(random.uniform(2.5, 3.5)) 
+            self._wait_for_product_growth(page, before_final_scroll_products, timeout_ms=3500)
+            # 以第一次等待后的数量为基线，否则已有新增时第二次等待会立即返回
+            after_first_wait_products = product_links.count()
             page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(random.uniform(2.5, 3.5))
+            self._wait_for_product_growth(page, after_first_wait_products, timeout_ms=3500)
             
             if self.debug_mode:
                 self.logger.info(f"  🔍 {final_round_name}：检查是否还有Show More按钮...")
@@ -539,7 +587,7 @@ class UltimateProductLinksCrawlerV2:
             if button_was_clicked_final_round:
                 if self.debug_mode:
                     self.logger.info(f"  🎯 {final_round_name}：发现并点击了Show More按钮！继续检查...")
-                time.sleep(random.uniform(3.0, 4.0))
+                self._wait_for_product_growth(page, product_links.count(), timeout_ms=4000)
                 consecutive_no_change_final = 0 
                 consecutive_no_button_final = 0 
             else:
@@ -553,7 +601,7 @@ class UltimateProductLinksCrawlerV2:
                     self.logger.info(f"🎯 连续 {consecutive_no_button_final} 轮最终确认未找到/点击Show More，确认已到页面底部！")
                     break
             
-            after_final_scroll_products = len(page.query_selector_all("a[href*='&Product=']"))
+            after_final_scroll_products = product_links.count()
             if self.debug_mode:
                 self.logger.info(f"📊 {final_round_name} 结果: {before_final_scroll_products} → {after_final_scroll_products}")
             
@@ -572,7 +620,7 @@ class UltimateProductLinksCrawlerV2:
                 if self.debug_mode:
                     self.logger.info(f"  🆕 {final_round_name} 发现新产品: +{after_final_scroll_products - before_final_scroll_products}")
         
-        final_product_count = len(page.query_selector_all("a[href*='&Product=']"))
+        final_product_count = product_links.count()
         self.logger.info(f"🏁 load_all_results完成，最终产品链接数: {final_product_count}")
         if target_count > 0:
             final_progress_percent = (final_product_count / target_count) * 100
@@ -603,6 +651,74 @@ class UltimateProductLinksCrawlerV2:
             self.logger.error(f"❌ 登录过程中发生严重错误: {e}", exc_info=self.debug_mode)
             return False
 
+    def _goto_leaf_page(self, page: Page, url: str):
+        """访问叶节点页面：不等待 networkidle（广告/统计请求会拖延数秒），DOM 就绪后等待产品链接或结果数文本出现"""
+        response = page.goto(url, wait_until='domcontentloaded')
+        if response is not None and response.status >= 400:
+            # 错误页既无产品链接也无结果数，直接返回，不空等超时
+            self.logger.warning(f"⚠️ 页面返回 HTTP {response.status}，跳过产品链接等待: {url}")
+            return
+        if '/sign-in' in page.url:
+            # 会话失效被重定向到登录页，登录页不会出现产品链接，交给调用方立即重新登录
+            return
+        try:
+            # 结果数文本（含 "0 results"）出现即可返回，空叶节点不必等到超时
+            page.wait_for_function(
+                self.LEAF_READY_JS,
+                arg=[self.PRODUCT_LINK_SELECTOR, NUMBER_RESULTS_PATTERN.pattern],
+                polling=self.LEAF_READY_POLL_MS
+            )
+        except Exception:
+            self.logger.warning(f"⚠️ 等待产品链接/结果数超时，继续处理: {url}")
+
+    def _set_resource_blocking(self, context: BrowserContext, enabled: bool):
+        """开启/关闭 context 上的重资源拦截（登录流程需要完整页面时临时关闭）"""
+        for pattern in (BLOCKED_ASSETS, BLOCKED_TRACKERS):
+            if enabled:
+                context.route(pattern, lambda route: route.abort())
+            else:
+                context.unroute(pattern)
+
+    def _session_state_valid(self, state: Dict[str, Any], margin: float = 60) -> bool:
+        """检查会话 cookies 是否仍有效：任一带过期时间的 cookie 将在 margin 秒内过期即视为失效（expires=-1 为会话 cookie）"""
+        cookies = state.get('cookies', [])
+        if not cookies:
+            return False
+        deadline = time.time() + margin
+        return all(c.get('expires', -1) == -1 or c['expires'] > deadline for c in cookies)
+
+    def _load_session_state(self) -> Optional[Dict[str, Any]]:
+        """从磁盘加载上次运行保存的登录会话（超过 session_timeout 的文件视为过期）"""
+        try:
+            if not self._session_file.exists():
+                return None
+            age = time.time() - self._session_file.stat().st_mtime
+            if age > Settings.AUTH['session_timeout']:
+                self.logger.info(f"⌛ 会话文件已超过 {Settings.AUTH['session_timeout']}s，忽略: {self._session_file}")
+                return None
+            with open(self._session_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if not isinstance(state, dict) or not isinstance(state.get('cookies'), list):
+                self.logger.warning(f"⚠️ 会话文件格式无效，将重新登录: {self._session_file}")
+                return None
+            self.logger.info(f"📂 已加载登录会话: {self._session_file}")
+            return state
+        except Exception as e:
+            self.logger.warning(f"⚠️ 加载会话文件失败，将重新登录: {e}")
+            return None
+
+    def _save_session_state(self, state: Dict[str, Any]):
+        """将登录会话保存到磁盘，供下次运行跳过登录（先写临时文件再原子替换，避免并发进程读到半截文件）"""
+        try:
+            self._session_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self._session_file.with_name(f"{self._session_file.name}.{os.getpid()}.tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_file, self._session_file)
+            self.logger.info(f"💾 登录会话已保存: {self._session_file}")
+        except Exception as e:
+            self.logger.warning(f"⚠️ 保存会话文件失败: {e}")
+
     def _tp_code_from_url(self, url: str) -> str:
         """从 leaf URL 提取 TP 编码，例 TP01002002006"""
         qs_part = urlparse(url).query
@@ -656,20 +772,28 @@ class UltimateProductLinksCrawlerV2:
             if p is None:
                 p = self._ensure_playwright_running()
             
+            if self._login_storage_state and not self._session_state_valid(self._login_storage_state):
+                self.logger.info("⌛ 已保存的登录会话 cookies 已过期，重新登录")
+                self._login_storage_state = None
+            # 本方法自行创建的 context 在创建时带入完整 storage_state（cookies + localStorage）
+            state_restored = False
+            
             if browser_instance is None:
                 if self.stealth11i:
                     browser_instance, context_instance, page_to_use = self.stealth11i.create_stealth_browser(p, headless=self.headless)
                     _internal_browser = True
                     _internal_context = True
                 else:
-                    self.logger.warning("Stealth module not available, launching standard browser.")
-                    browser_instance = p.chromium.launch(headless=self.headless)
-                    _internal_browser = True
-                    context_instance = browser_instance.new_context()
+                    self.logger.warning("Stealth module not available, using shared standard browser.")
+                    # 共享浏览器不随叶节点关闭（_internal_browser 保持 False），由 close() 统一关闭
+                    browser_instance = self._get_shared_browser(p)
+                    context_instance = browser_instance.new_context(storage_state=self._login_storage_state)
+                    state_restored = self._login_storage_state is not None
                     _internal_context = True
                     page_to_use = context_instance.new_page()
             elif context_instance is None:
-                context_instance = browser_instance.new_context()
+                context_instance = browser_instance.new_context(storage_state=self._login_storage_state)
+                state_restored = self._login_storage_state is not None
                 _internal_context = True
                 page_to_use = context_instance.new_page()
             elif page_to_use is None:
@@ -679,29 +803,63 @@ class UltimateProductLinksCrawlerV2:
                 self.logger.error("❌ Critical: Could not obtain a page object.")
                 return [], {"error": "Failed to obtain page object"}
 
+            # 统一设置页面默认超时，各操作无需再逐个传 timeout
+            page_to_use.set_default_timeout(self.DEFAULT_TIMEOUT_MS)
+            page_to_use.set_default_navigation_timeout(self.NAVIGATION_TIMEOUT_MS)
+
             login_skipped_or_failed = False
-            if self.stealth11i and (email or os.getenv("TRACEPARTS_EMAIL")):
-                if not self._perform_login(page_to_use, email, password):
+            session_reused = False
+            if self._login_storage_state:
+                # 复用已登录的会话（本实例内或上次运行保存的），跳过重复登录
+                if not state_restored:
+                    # stealth 模块创建或外部传入的 context 无法在创建时带入 storage_state，只能补回 cookies
+                    page_to_use.context.add_cookies(self._login_storage_state.get('cookies', []))
+                self.logger.info("♻️ 复用已登录会话，跳过登录流程")
+                session_reused = True
+            elif self.stealth11i and (email or os.getenv("TRACEPARTS_EMAIL")):
+                if self._perform_login(page_to_use, email, password):
+                    self._login_storage_state = page_to_use.context.storage_state()
+                    self._save_session_state(self._login_storage_state)
+                else:
                     login_skipped_or_failed = True
             else:
                 self.logger.info("⏭️ 登录跳过 (无stealth模块或未配置邮箱).")
                 login_skipped_or_failed = True
 
+            if _internal_context:
+                # 仅对本方法创建的 context 拦截重资源，外部传入的 context 保持原样
+                self._set_resource_blocking(context_instance, True)
+
             enhanced_url = self.append_page_size(leaf_url, 500)
             self.logger.info(f"🌐 访问增强URL: {enhanced_url}")
             
-            page_to_use.goto(enhanced_url, timeout=60000, wait_until='networkidle')
+            self._goto_leaf_page(page_to_use, enhanced_url)
+
+            if session_reused and '/sign-in' in page_to_use.url:
+                # 复用的会话已被服务端判定失效（跳转到登录页），退回完整登录流程
+                self.logger.warning("⚠️ 复用的会话已失效（被重定向到登录页），重新登录")
+                self._login_storage_state = None
+                if _internal_context:
+                    self._set_resource_blocking(context_instance, False)
+                if self._perform_login(page_to_use, email, password):
+                    self._login_storage_state = page_to_use.context.storage_state()
+                    self._save_session_state(self._login_storage_state)
+                else:
+                    login_skipped_or_failed = True
+                if _internal_context:
+                    self._set_resource_blocking(context_instance, True)
+                self._goto_leaf_page(page_to_use, enhanced_url)
 
             is_leaf, target_count = self.detect_leaf_node_and_target_count(page_to_use)
             if not is_leaf:
                 self.logger.warning(f"⚠️ 页面 {leaf_url} 似乎不是叶节点 (基于test-08逻辑)，但继续尝试抓取...")
 
-            initial_elements = page_to_use.query_selector_all("a[href*='&Product=']")
-            self.logger.info(f"📊 页面初始加载的产品链接数: {len(initial_elements)}")
+            initial_count = page_to_use.locator(self.PRODUCT_LINK_SELECTOR).count()
+            self.logger.info(f"📊 页面初始加载的产品链接数: {initial_count}")
             if target_count > 0:
                 self.logger.info(f"🎯 目标产品总数 (来自页面提取): {target_count}")
-                if len(initial_elements) > target_count:
-                    self.logger.warning(f"⚠️ 初始加载数 ({len(initial_elements)}) 大于提取到的目标数 ({target_count}). 将以目标数为准进行进度判断，但可能全部已加载。")
+                if initial_count > target_count:
+                    self.logger.warning(f"⚠️ 初始加载数 ({initial_count}) 大于提取到的目标数 ({target_count}). 将以目标数为准进行进度判断，但可能全部已加载。")
 
             self.load_all_results(page_to_use, target_count)
             
@@ -716,7 +874,7 @@ class UltimateProductLinksCrawlerV2:
                 "tp_code": actual_tp_code,
                 "extracted_count": final_extracted_count,
                 "target_count_on_page": target_count,
-                "initial_load_count": len(initial_elements),
+                "initial_load_count": initial_count,
                 "progress_percentage": 0.0,
                 "completion_status": "unknown",
                 "login_skipped_or_failed": login_skipped_or_failed,
@@ -767,19 +925,20 @@ class UltimateProductLinksCrawlerV2:
                  except Exception as e_close:
                      self.logger.warning(f"Error closing browser for {leaf_url}: {e_close}", exc_info=self.debug_mode)
             
-            if self._created_playwright_internally and self.playwright_instance:
-                try:
-                    self.playwright_instance.stop()
-                    self.playwright_instance = None
-                    self._created_playwright_internally = False
-                except Exception as e_stop:
-                     self.logger.warning(f"Error stopping internal Playwright: {e_stop}", exc_info=self.debug_mode)
+            # 内部启动的 Playwright 保持运行，供后续叶节点复用，由 close() 统一停止
 
     def close(self):
         """
         Clean up any persistent resources, like a Playwright instance
         if it was started by this class and not passed in.
         """
+        if self._shared_browser:
+            try:
+                self._shared_browser.close()
+            except Exception as e:
+                self.logger.warning(f"Error closing shared browser in close(): {e}", exc_info=self.debug_mode)
+            self._shared_browser = None
+        
         if self._created_playwright_internally and self.playwright_instance:
             try:
                 self.playwright_instance.stop()
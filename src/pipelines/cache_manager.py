@@ -405,6 +405,9 @@ class CacheManager:
         successful_outputs = 0
         failed_outputs = 0
         
+        # 本批输出共用同一生成时间，避免逐个产品调用 strftime
+        extraction_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
         for leaf in data.get('leaves', []):
             leaf_code = leaf.get('code', 'unknown')
             leaf_name = leaf.get('name', 'Unknown Category')
@@ -446,7 +449,7 @@ class CacheManager:
                     
                     # 🎯 2. 构建test-09-1标准格式的JSON (完全复制test-09-1逻辑)
                     test_09_1_output = {
-                        'extraction_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),  # 与test-09-1时间格式一致
+                        'extraction_time': extraction_time,  # 与test-09-1时间格式一致
                         'base_product': {
                             'name': base_product_info['base_product_name'],
                             'id': base_product_info['product_id'],
@@ -875,6 +878,9 @@ class CacheManager:
             # 合并正常结果
             leaf_products.update(normal_results)
         
+        # 串行模式下 Playwright 实例在各叶节点间复用，阶段结束后统一停止
+        self.products_crawler.close()
+        
         # 更新数据结构
         self._update_tree_with_products(data, leaf_products)
         
@@ -1124,9 +1130,7 @@ class CacheManager:
                     
                     # 仅在成功且拿到规格时写入文件，避免空文件占位
                     if specs:
-                        # 确保目录存在
-                        self.specs_cache_dir.mkdir(parents=True, exist_ok=True)
-                        
+                        # specs_cache_dir 已在 __init__ 中创建，无需逐个产品重复 mkdir
                         # 🎯 构建 test-09-1 标准完整 JSON 并写入缓存
                         product_output_json = self._build_single_test_09_1_output(product_url, specs)
                         if not product_output_json:
@@ -1164,6 +1168,9 @@ class CacheManager:
                 if processed_count % 1000 == 0:
                     self.logger.info(f"📊 进度报告: {processed_count}/{len(all_products)} 产品, {success_count} 成功, {total_specs} 总规格")
         
+        # 规格阶段结束，关闭各线程复用的driver
+        self.specifications_crawler.close_drivers()
+        
         # 更新数据结构
         self._update_tree_with_specifications(data, product_specs)
         
@@ -1712,8 +1719,13 @@ class CacheManager:
         """关闭缓存管理器，清理资源"""
         self.logger.info("🛑 关闭缓存管理器...")
         
-        # 清理规格爬取器资源（如果需要）
-        # 原版规格爬取器不需要特殊关闭，这里预留给将来扩展
+        # 停止产品链接爬取器复用的 Playwright 实例
+        if getattr(self, 'products_crawler', None):
+            self.products_crawler.close()
+        
+        # 关闭规格爬取器复用的线程driver
+        if getattr(self, 'specifications_crawler', None):
+            self.specifications_crawler.close_drivers()
         
         self.logger.info("✅ 缓存管理器已关闭")
     
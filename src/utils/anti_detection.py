@@ -6,6 +6,7 @@
 动态伪装和反爬策略
 """
 
+import os
 import random
 import time
 import logging
@@ -13,11 +14,99 @@ from typing import List, Dict, Any
 from selenium.webdriver.chrome.options import Options
 
 
+# 隐身预加载脚本（模块加载时构建一次，各driver复用同一字符串）
+# 移除webdriver属性（在原型上删除，getOwnPropertyDescriptor 检测不到覆盖痕迹）
+STEALTH_WEBDRIVER_JS = "delete Object.getPrototypeOf(navigator).webdriver;"
+
+# 补全Chrome对象：真实Chrome已自带 window.chrome，仅在缺失时补齐，
+# 不再额外伪造 navigator.chrome（真实浏览器没有该属性，重复覆盖反而暴露）
+STEALTH_CHROME_JS = """
+    if (!window.chrome) {
+        window.chrome = {
+            runtime: {},
+            loadTimes: function() {},
+            csi: function() {},
+            app: {}
+        };
+    }
+"""
+
+# 伪造权限API
+STEALTH_PERMISSIONS_JS = """
+    Object.defineProperty(navigator, 'permissions', {
+        get: () => ({
+            query: function() {
+                return Promise.resolve({ state: 'granted' });
+            },
+        }),
+    });
+"""
+
+# 伪造插件信息（以 PluginArray 为原型，instanceof 检测可通过）
+STEALTH_PLUGINS_JS = """
+    const fakePlugins = [
+        { name: 'Chrome PDF Plugin', description: 'Portable Document Format' },
+        { name: 'Shockwave Flash', description: 'Shockwave Flash 32.0 r0' },
+    ];
+    fakePlugins.forEach(function (p) { Object.setPrototypeOf(p, Plugin.prototype); });
+    Object.setPrototypeOf(fakePlugins, PluginArray.prototype);
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => fakePlugins,
+    });
+"""
+
+# 分级防护：第1级只处理高置信度的自动化特征；第2级额外伪装 chrome/plugins，
+# 这些属性本身也可能被指纹检测，只在确实遭遇检测时再启用
+STEALTH_TIER1_SCRIPTS = (
+    STEALTH_WEBDRIVER_JS,
+    STEALTH_PERMISSIONS_JS,
+)
+STEALTH_TIER2_SCRIPTS = (
+    STEALTH_CHROME_JS,
+    STEALTH_PLUGINS_JS,
+)
+
+# 隐身级别（环境变量 CRAWLER_STEALTH_LEVEL，默认2即全部补丁）
+DEFAULT_STEALTH_LEVEL = 2
+
+
+def _parse_stealth_level(value, default: int = DEFAULT_STEALTH_LEVEL) -> int:
+    """解析隐身级别：非整数回退默认值，越界截断到 1..2，均记录警告（导入时调用，不能抛异常）"""
+    try:
+        level = int(value)
+    except (TypeError, ValueError):
+        logging.getLogger(__name__).warning(f"⚠️ 无效的隐身级别 {value!r}，使用默认级别 {default}")
+        return default
+    if level not in (1, 2):
+        clamped = min(max(level, 1), 2)
+        logging.getLogger(__name__).warning(f"⚠️ 隐身级别 {level} 超出范围 1..2，按 {clamped} 处理")
+        return clamped
+    return level
+
+
+STEALTH_LEVEL = _parse_stealth_level(os.getenv('CRAWLER_STEALTH_LEVEL', str(DEFAULT_STEALTH_LEVEL)))
+
+
+def _build_stealth_init_js(scripts) -> str:
+    """合并为单个 IIFE，一次 CDP 调用完成注册；各段独立 try/catch，互不影响"""
+    return "(() => {\n" + "\n".join(
+        "try {%s} catch (e) {}" % script for script in scripts
+    ) + "\n})();"
+
+
+# 各级别对应的合并脚本（导入时构建一次）
+STEALTH_INIT_JS_BY_LEVEL = {
+    1: _build_stealth_init_js(STEALTH_TIER1_SCRIPTS),
+    2: _build_stealth_init_js(STEALTH_TIER1_SCRIPTS + STEALTH_TIER2_SCRIPTS),
+}
+
+
 class AntiDetectionManager:
     """反检测管理器"""
     
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, stealth_level: int = None):
         self.logger = logger or logging.getLogger(__name__)
+        self.stealth_level = _parse_stealth_level(stealth_level) if stealth_level is not None else STEALTH_LEVEL
         
         # 扩展的User-Agent池
         self.user_agents = [
@@ -104,11 +193,14 @@ class AntiDetectionManager:
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
         
-        # 性能优化
-        options.add_argument('--disable-images')
-        options.add_argument('--disable-javascript')  # 根据需要可以启用
+        # 性能优化（Chrome 并无 --disable-images/--disable-javascript 开关，图片需经 blink-settings 关闭）
+        options.add_argument('--blink-settings=imagesEnabled=false')
         options.add_argument('--disable-plugins')
         options.add_argument('--disable-extensions')
+        options.add_argument('--disable-sync')
+        options.add_argument('--disable-translate')
+        options.add_argument('--disable-background-networking')
+        options.add_argument('--metrics-recording-only')
         
         # 内存优化
         options.add_argument('--memory-pressure-off')
@@ -116,7 +208,6 @@ class AntiDetectionManager:
         
         # 网络优化
         options.add_argument('--aggressive-cache-discard')
-        options.add_argument('--disable-background-timer-throttling')
         
         # 供应商特定优化
         if vendor_hint:
@@ -168,46 +259,20 @@ class AntiDetectionManager:
         
         self.last_request_time = time.time()
     
+    def _add_stealth_script(self, driver, source: str):
+        """注册在每个新文档加载前执行的脚本（CDP），不支持CDP时退回到当前页面执行"""
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+        except Exception:
+            driver.execute_script(source)
+    
     def setup_driver_stealth(self, driver):
-        """设置driver隐身模式"""
+        """设置driver隐身模式（通过CDP预加载，页面跳转后依然生效）"""
         try:
-            # 移除webdriver属性
-            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            
-            # 伪造Chrome对象
-            driver.execute_script("""
-                Object.defineProperty(navigator, 'chrome', {
-                    get: () => ({
-                        runtime: {},
-                        loadTimes: function() {},
-                        csi: function() {},
-                        app: {}
-                    }),
-                });
-            """)
-            
-            # 伪造权限API
-            driver.execute_script("""
-                Object.defineProperty(navigator, 'permissions', {
-                    get: () => ({
-                        query: function() {
-                            return Promise.resolve({ state: 'granted' });
-                        },
-                    }),
-                });
-            """)
-            
-            # 伪造插件信息
-            driver.execute_script("""
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => ([
-                        { name: 'Chrome PDF Plugin', description: 'Portable Document Format' },
-                        { name: 'Shockwave Flash', description: 'Shockwave Flash 32.0 r0' },
-                    ]),
-                });
-            """)
+            # 按隐身级别选择补丁，合并为一个脚本，只需一次 CDP 往返
+            self._add_stealth_script(driver, STEALTH_INIT_JS_BY_LEVEL[self.stealth_level])
             
-            self.logger.debug("🥷 Driver隐身模式已设置")
+            self.logger.debug(f"🥷 Driver隐身模式已设置 (级别 {self.stealth_level})")
             
         except Exception as e:
             self.logger.warning(f"⚠️ 隐身模式设置失败: {e}")
@@ -12,6 +12,7 @@ import threading
 from typing import List, Dict, Any, Optional, Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed, Future
 from queue import Queue, Empty
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
 
@@ -93,9 +94,14 @@ class SmartThreadPool:
         # 当前每个供应商的活跃任务数
         self.vendor_active_count = {}
         self.vendor_lock = threading.Lock()
+        # 槽位释放时通知等待者，替代固定次数的 sleep 轮询
+        self.vendor_slot_released = threading.Condition(self.vendor_lock)
+        self.vendor_slot_wait_timeout = 10.0  # 等待供应商槽位的最长时间（秒）
         
         # 错误率监控
-        self.error_windows = {}  # 滑动窗口错误率
+        self.error_windows = {}  # 滑动窗口错误率（每个供应商一个有界 deque）
+        self.error_window_size = 200  # 窗口最多保留的记录数
+        self.error_window_lock = threading.Lock()  # 多个工作线程并发读写窗口，需加锁
         self.error_threshold = 0.3  # 30%错误率阈值
         self.cooldown_vendors = set()  # 正在冷却的供应商
         
@@ -132,27 +138,18 @@ class SmartThreadPool:
         """执行任务并监控性能"""
         start_time = time.time()
         
-        # 检查供应商并发限制 - 使用更智能的等待策略
-        max_wait_attempts = 10
-        wait_time = 0.1
-        
-        for attempt in range(max_wait_attempts):
-            if self._acquire_vendor_slot(task.vendor):
-                break
-            
-            if attempt == 0:
-                self.logger.warning(f"⚠️ 供应商 {task.vendor} 并发已满，等待...")
+        # 检查供应商并发限制 - 槽位满时阻塞等待释放通知，而非轮询
+        if not self._acquire_vendor_slot(task.vendor):
+            self.logger.warning(f"⚠️ 供应商 {task.vendor} 并发已满，等待...")
             
-            time.sleep(wait_time)
-            wait_time = min(wait_time * 1.5, 2.0)  # 指数退避，最大2秒
-        else:
-            # 如果等待超时，仍然尝试处理，但使用降级策略
-            self.logger.error(f"❌ 供应商 {task.vendor} 等待超时，跳过任务")
-            return {
-                'success': False,
-                'error': f'Vendor {task.vendor} concurrency wait timeout',
-                'task_id': task.id
-            }
+            if not self._acquire_vendor_slot(task.vendor, timeout=self.vendor_slot_wait_timeout):
+                # 如果等待超时，仍然尝试处理，但使用降级策略
+                self.logger.error(f"❌ 供应商 {task.vendor} 等待超时，跳过任务")
+                return {
+                    'success': False,
+                    'error': f'Vendor {task.vendor} concurrency wait timeout',
+                    'task_id': task.id
+                }
         
         try:
             # 获取线程专用资源
@@ -196,23 +193,25 @@ class SmartThreadPool:
             if task.id in self.active_tasks:
                 del self.active_tasks[task.id]
     
-    def _acquire_vendor_slot(self, vendor: str) -> bool:
-        """获取供应商并发槽位"""
-        with self.vendor_lock:
-            current_count = self.vendor_active_count.get(vendor, 0)
-            limit = self.vendor_limits.get(vendor, self.vendor_limits['generic'])
-            
-            if current_count < limit:
-                self.vendor_active_count[vendor] = current_count + 1
-                return True
-            return False
+    def _acquire_vendor_slot(self, vendor: str, timeout: float = 0) -> bool:
+        """获取供应商并发槽位（timeout>0 时阻塞等待槽位释放）"""
+        limit = self.vendor_limits.get(vendor, self.vendor_limits['generic'])
+        with self.vendor_slot_released:
+            has_slot = self.vendor_slot_released.wait_for(
+                lambda: self.vendor_active_count.get(vendor, 0) < limit,
+                timeout=timeout
+            )
+            if has_slot:
+                self.vendor_active_count[vendor] = self.vendor_active_count.get(vendor, 0) + 1
+            return has_slot
     
     def _release_vendor_slot(self, vendor: str):
         """释放供应商并发槽位"""
-        with self.vendor_lock:
+        with self.vendor_slot_released:
             current_count = self.vendor_active_count.get(vendor, 0)
             if current_count > 0:
                 self.vendor_active_count[vendor] = current_count - 1
+                self.vendor_slot_released.notify_all()
     
     def _get_thread_resources(self, vendor: str) -> Dict[str, Any]:
         """获取线程专用资源"""
@@ -297,33 +296,33 @@ class SmartThreadPool:
     
     def _update_error_window(self, vendor: str, success: bool):
         """更新错误率滑动窗口"""
-        if vendor not in self.error_windows:
-            self.error_windows[vendor] = []
-        
-        window = self.error_windows[vendor]
         current_time = time.time()
-        
-        # 添加当前结果
-        window.append({
-            'timestamp': current_time,
-            'success': success
-        })
-        
-        # 清理5分钟前的记录
-        window[:] = [r for r in window if current_time - r['timestamp'] < 300]
+        with self.error_window_lock:
+            if vendor not in self.error_windows:
+                self.error_windows[vendor] = deque(maxlen=self.error_window_size)
+            
+            window = self.error_windows[vendor]
+            
+            # 添加当前结果（超出容量时自动淘汰最旧记录）
+            window.append({
+                'timestamp': current_time,
+                'success': success
+            })
+            
+            # 清理5分钟前的记录：记录按时间有序，只需从左端弹出
+            while window and current_time - window[0]['timestamp'] >= 300:
+                window.popleft()
     
     def _check_vendor_cooldown(self, vendor: str):
         """检查供应商是否需要冷却"""
-        if vendor not in self.error_windows:
-            return
-        
-        window = self.error_windows[vendor]
-        if len(window) < 10:  # 样本太少，不进行判断
-            return
-        
-        # 计算错误率
-        failed_count = sum(1 for r in window if not r['success'])
-        error_rate = failed_count / len(window)
+        with self.error_window_lock:
+            window = self.error_windows.get(vendor)
+            if not window or len(window) < 10:  # 样本太少，不进行判断
+                return
+            
+            # 计算错误率
+            failed_count = sum(1 for r in window if not r['success'])
+            error_rate = failed_count / len(window)
         
         if error_rate > self.error_threshold and vendor not in self.cooldown_vendors:
             self.logger.warning(f"🧊 供应商 {vendor} 错误率过高 ({error_rate:.1%})，启动冷却")
@@ -15,6 +15,43 @@ from selenium.webdriver.common.by import By
 from selenium.common.exceptions import TimeoutException
 
 
+# 页面AJAX空闲检测脚本：无jQuery/Angular时视为空闲
+AJAX_IDLE_SCRIPT = """
+    var jqueryIdle = (typeof jQuery === 'undefined') || jQuery.active == 0;
+    var angularIdle = (typeof window.getAllAngularTestabilities !== 'function') ||
+        window.getAllAngularTestabilities().findIndex(function (x) { return !x.isStable(); }) === -1;
+    return jqueryIdle && angularIdle;
+"""
+
+# 规格数据就绪检测脚本：可见表格且至少2行，或可见且有文本的 spec/technical/detail 容器
+SPECS_READY_SCRIPT = """
+    function visible(el) {
+        return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    }
+    var tables = document.getElementsByTagName('table');
+    for (var i = 0; i < tables.length; i++) {
+        if (visible(tables[i]) && tables[i].getElementsByTagName('tr').length >= 2) {
+            return true;
+        }
+    }
+    var containers = document.querySelectorAll(
+        "div[class*='spec'], div[class*='technical'], div[class*='detail']");
+    for (var j = 0; j < containers.length; j++) {
+        if (visible(containers[j]) && (containers[j].innerText || '').trim()) {
+            return true;
+        }
+    }
+    return false;
+"""
+
+# 主要内容检测脚本：表格或 spec/product/technical 容器任一出现即视为已加载
+CONTENT_LOADED_SCRIPT = """
+    return document.querySelector(
+        "table, div[class*='spec'], div[class*='product'], div[class*='technical']"
+    ) !== null;
+"""
+
+
 class SmartWaiter:
     """智能等待器"""
     
@@ -22,6 +59,12 @@ class SmartWaiter:
         self.driver = driver
         self.logger = logger or logging.getLogger(__name__)
         
+        # WebDriverWait 轮询间隔（默认0.5秒，缩短以减少条件满足后的等待延迟）
+        self.poll_frequency = 0.1
+        
+        # 按超时时间缓存的 WebDriverWait 实例（同一driver可复用）
+        self._waits = {}
+        
         # 不同页面类型的等待配置
         self.wait_configs = {
             'industrietechnik': {
@@ -44,6 +87,14 @@ class SmartWaiter:
             }
         }
     
+    def _wait(self, timeout: float) -> WebDriverWait:
+        """获取指定超时时间的 WebDriverWait（首次创建后复用）"""
+        wait = self._waits.get(timeout)
+        if wait is None:
+            wait = WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency)
+            self._waits[timeout] = wait
+        return wait
+    
     def wait_for_page_ready(self, page_type: str = 'default') -> bool:
         """等待页面就绪"""
         config = self.wait_configs.get(page_type, self.wait_configs['default'])
@@ -51,7 +102,7 @@ class SmartWaiter:
         try:
             # 1. 基础DOM就绪
             self.logger.debug(f"⏳ 等待基础DOM就绪...")
-            WebDriverWait(self.driver, config['base_wait']).until(
+            self._wait(config['base_wait']).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
@@ -79,14 +130,9 @@ class SmartWaiter:
     def _wait_for_content_loaded(self, timeout: int) -> bool:
         """等待主要内容加载"""
         try:
-            # 等待表格或规格容器出现
-            WebDriverWait(self.driver, timeout).until(
-                lambda d: (
-                    len(d.find_elements(By.TAG_NAME, 'table')) > 0 or
-                    len(d.find_elements(By.XPATH, "//div[contains(@class, 'spec')]")) > 0 or
-                    len(d.find_elements(By.XPATH, "//div[contains(@class, 'product')]")) > 0 or
-                    len(d.find_elements(By.XPATH, "//div[contains(@class, 'technical')]")) > 0
-                )
+            # 等待表格或规格容器出现（所有选择器在浏览器内一次检查）
+            self._wait(timeout).until(
+                lambda d: d.execute_script(CONTENT_LOADED_SCRIPT)
             )
             return True
         except TimeoutException:
@@ -96,17 +142,11 @@ class SmartWaiter:
     def _wait_for_ajax_complete(self, timeout: int) -> bool:
         """等待AJAX请求完成"""
         try:
-            # 检查jQuery活动请求
-            WebDriverWait(self.driver, timeout).until(
-                lambda d: d.execute_script("return jQuery.active == 0") if self._has_jquery() else True
+            # jQuery/Angular 检测与状态判断合并为一次 execute_script，每轮轮询只需一次往返
+            self._wait(timeout).until(
+                lambda d: d.execute_script(AJAX_IDLE_SCRIPT)
             )
             
-            # 检查Angular请求
-            if self._has_angular():
-                WebDriverWait(self.driver, timeout).until(
-                    lambda d: d.execute_script("return window.getAllAngularTestabilities().findIndex(x=>!x.isStable()) === -1")
-                )
-            
             # 检查Fetch/XHR请求（通用方法）
             self._wait_for_network_idle(min(timeout, 5))
             
@@ -118,48 +158,21 @@ class SmartWaiter:
             self.logger.debug(f"AJAX检查失败: {e}")
             return False
     
-    def _has_jquery(self) -> bool:
-        """检查页面是否有jQuery"""
-        try:
-            return self.driver.execute_script("return typeof jQuery !== 'undefined'")
-        except:
-            return False
-    
-    def _has_angular(self) -> bool:
-        """检查页面是否有Angular"""
-        try:
-            return self.driver.execute_script("return typeof window.getAllAngularTestabilities === 'function'")
-        except:
-            return False
-    
     def _wait_for_network_idle(self, timeout: int) -> bool:
         """等待网络空闲"""
         try:
-            start_time = time.time()
-            stable_count = 0
-            required_stable_count = 3  # 需要连续3次检查都稳定
-            
-            while time.time() - start_time < timeout:
-                # 检查页面是否还在加载
-                ready_state = self.driver.execute_script("return document.readyState")
-                if ready_state == 'complete':
-                    stable_count += 1
-                else:
-                    stable_count = 0
-                
-                if stable_count >= required_stable_count:
-                    return True
-                
-                time.sleep(0.5)
-            
-            return False
+            # readyState 变为 complete 后不会回退，短间隔轮询到即返回，无需连续多次确认
+            self._wait(timeout).until(
+                lambda d: d.execute_script("return document.readyState") == 'complete'
+            )
+            return True
         except Exception:
             return False
     
     def wait_for_element_visible(self, locator: tuple, timeout: int = 10) -> bool:
         """等待元素可见"""
         try:
-            WebDriverWait(self.driver, timeout).until(
+            self._wait(timeout).until(
                 EC.visibility_of_element_located(locator)
             )
             return True
@@ -169,7 +182,7 @@ class SmartWaiter:
     def wait_for_elements_present(self, locator: tuple, min_count: int = 1, timeout: int = 10) -> bool:
         """等待指定数量的元素出现"""
         try:
-            WebDriverWait(self.driver, timeout).until(
+            self._wait(timeout).until(
                 lambda d: len(d.find_elements(*locator)) >= min_count
             )
             return True
@@ -198,24 +211,8 @@ class SmartWaiter:
         def check_specs_ready():
             """检查规格数据是否就绪"""
             try:
-                # 检查表格
-                tables = self.driver.find_elements(By.TAG_NAME, 'table')
-                if tables:
-                    for table in tables:
-                        if table.is_displayed():
-                            rows = table.find_elements(By.TAG_NAME, 'tr')
-                            if len(rows) >= 2:  # 至少有标题行和数据行
-                                return True
-                
-                # 检查规格容器
-                spec_containers = self.driver.find_elements(By.XPATH, 
-                    "//div[contains(@class, 'spec') or contains(@class, 'technical') or contains(@class, 'detail')]")
-                
-                for container in spec_containers:
-                    if container.is_displayed() and container.text.strip():
-                        return True
-                
-                return False
+                # 可见表格（至少有标题行和数据行）或有文本的可见规格容器，一次脚本完成判断
+                return bool(self.driver.execute_script(SPECS_READY_SCRIPT))
             except Exception:
                 return False
         